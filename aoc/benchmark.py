@@ -0,0 +1,190 @@
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from types import ModuleType
+from typing import Any, Callable
+
+from aoc.generators import GENERATORS, GENERATORS_VERSION
+from aoc.runner import REPOSITORY_DIR, import_day_module, run_day
+
+# Meaning of size differs per day: lines for line-based inputs, side length for day 3, intervals per conversion and
+# seed ranges for day 5, races for day 6 and nodes for day 8
+BENCHMARK_TIERS = {
+	1: {"small": 10_000, "medium": 1_000_000, "large": 10_000_000},
+	2: {"small": 10_000, "medium": 100_000, "large": 1_000_000},
+	3: {"small": 100, "medium": 1_000, "large": 10_000},
+	4: {"small": 1_000, "medium": 100_000, "large": 1_000_000},
+	5: {"small": 100, "medium": 10_000, "large": 100_000},
+	6: {"small": 10, "medium": 100, "large": 1_000},
+	7: {"small": 10_000, "medium": 100_000, "large": 1_000_000},
+	8: {"small": 1_000, "medium": 10_000, "large": 40_000},
+	9: {"small": 1_000, "medium": 100_000, "large": 1_000_000},
+}
+CUSTOM_TIER = "custom"
+# parsers built on the shared integer tokenizer and the original string splitting parsers they replaced
+PARSER_PAIRS: dict[int, Callable[[ModuleType], tuple[Callable[[str], Any], Callable[[str], Any]]]] = {
+	4: lambda module: (module.parse_input, module.parse_input_reference),
+	5: lambda module: (module.parse_almanac, lambda path: module.parse_almanac(path=path, reference=True)),
+	9: lambda module: (module.parse_input, module.parse_input_reference),
+}
+
+
+def get_peak_rss_bytes() -> int:
+	"""
+	Helper method returning peak resident set size of the current process.
+	:return: peak RSS in bytes
+	"""
+	peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def get_commit() -> str | None:
+	"""
+	Helper method returning the commit the repository is at, so that reports from different commits can be compared.
+	:return: commit hash or None if it cannot be determined
+	"""
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "HEAD"], cwd=REPOSITORY_DIR, capture_output=True, text=True, check=True
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def benchmark_day(day: int, input_path: str) -> dict:
+	"""
+	Method running a single day and extending its timings with peak memory usage and throughput. It is meant to be run
+	in a fresh process, otherwise peak RSS includes earlier work of the process.
+	:param day: day number
+	:param input_path: path to the input file
+	:return: dictionary with answers, timings, peak RSS and throughput
+	"""
+	result = run_day(day=day, input_path=input_path)
+	solve_seconds = result["parse_seconds"] + result["part_one"]["seconds"] + result["part_two"]["seconds"]
+	input_bytes = os.path.getsize(input_path)
+	result["peak_rss_bytes"] = get_peak_rss_bytes()
+	result["input_bytes"] = input_bytes
+	result["throughput_bytes_per_second"] = input_bytes / solve_seconds if solve_seconds > 0 else None
+	return result
+
+
+def get_benchmark_input(day: int, size: int, work_dir: str, seed: int = 0) -> str:
+	"""
+	Method returning path to a synthetic input of given size, generating it only if it does not exist yet.
+	:param day: day number
+	:param size: input size, meaning depends on the day
+	:param work_dir: directory holding generated inputs
+	:param seed: random generator seed
+	:return: path to the input file
+	"""
+	os.makedirs(work_dir, exist_ok=True)
+	input_path = os.path.join(work_dir, f"day{day}_v{GENERATORS_VERSION}_size{size}_seed{seed}.txt")
+	if not os.path.exists(input_path):
+		GENERATORS[day](input_path, size, seed)
+	return input_path
+
+
+def run_benchmark(
+		days: list[int], tiers: list[str], work_dir: str, size: int | None = None, seed: int = 0
+) -> dict:
+	"""
+	Method benchmarking selected days across size tiers. Every measurement runs in a new spawned process, so that peak
+	RSS and import times are not affected by previous measurements.
+	:param days: list of day numbers
+	:param tiers: list of tier names from BENCHMARK_TIERS
+	:param work_dir: directory holding generated inputs
+	:param size: explicit input size used instead of tiers
+	:param seed: random generator seed
+	:return: report with environment details and results of every measurement
+	"""
+	results = []
+	for day in days:
+		sizes = {CUSTOM_TIER: size} if size is not None else {tier: BENCHMARK_TIERS[day][tier] for tier in tiers}
+		for tier, tier_size in sizes.items():
+			input_path = get_benchmark_input(day=day, size=tier_size, work_dir=work_dir, seed=seed)
+			with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+				result = executor.submit(benchmark_day, day, input_path).result()
+			result.update({"tier": tier, "size": tier_size, "seed": seed})
+			results.append(result)
+	return {
+		"commit": get_commit(),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"results": results,
+	}
+
+
+def _get_best_time(function: Callable[[str], Any], path: str, repeat: int) -> tuple[float, Any]:
+	best_time, parsed = float("inf"), None
+	for _ in range(repeat):
+		start = time.perf_counter()
+		parsed = function(path)
+		best_time = min(best_time, time.perf_counter() - start)
+	return best_time, parsed
+
+
+def benchmark_parsers(
+		days: list[int], tiers: list[str], work_dir: str, size: int | None = None, seed: int = 0, repeat: int = 3
+) -> dict:
+	"""
+	Method comparing parsers built on the shared integer tokenizer with the original parsers of the same days, on the
+	same synthetic inputs as run_benchmark. Both parsers are run in the current process, the best of repeat runs is
+	reported.
+	:param days: list of day numbers, days without a parser pair in PARSER_PAIRS are skipped
+	:param tiers: list of tier names from BENCHMARK_TIERS
+	:param work_dir: directory holding generated inputs
+	:param size: explicit input size used instead of tiers
+	:param seed: random generator seed
+	:param repeat: number of runs of each parser
+	:return: report with timings of both parsers and whether their results are equal
+	"""
+	results = []
+	for day in [day for day in days if day in PARSER_PAIRS]:
+		parse, parse_reference = PARSER_PAIRS[day](import_day_module(day=day))
+		sizes = {CUSTOM_TIER: size} if size is not None else {tier: BENCHMARK_TIERS[day][tier] for tier in tiers}
+		for tier, tier_size in sizes.items():
+			input_path = get_benchmark_input(day=day, size=tier_size, work_dir=work_dir, seed=seed)
+			tokenizer_seconds, parsed = _get_best_time(function=parse, path=input_path, repeat=repeat)
+			reference_seconds, parsed_reference = _get_best_time(function=parse_reference, path=input_path, repeat=repeat)
+			results.append({
+				"day": day,
+				"tier": tier,
+				"size": tier_size,
+				"seed": seed,
+				"input_bytes": os.path.getsize(input_path),
+				"tokenizer_seconds": tokenizer_seconds,
+				"reference_seconds": reference_seconds,
+				"speedup": reference_seconds / tokenizer_seconds if tokenizer_seconds > 0 else None,
+				"equal": parsed == parsed_reference,
+			})
+	return {
+		"commit": get_commit(),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"results": results,
+	}
+
+
+def compare_reports(baseline: dict, report: dict) -> dict:
+	"""
+	Method annotating results of a report with times of matching (day, size, seed) results of a baseline report.
+	:param baseline: earlier benchmark report
+	:param report: current benchmark report
+	:return: the current report with baseline times and speedups added where a match exists
+	"""
+	baseline_results = {
+		(result["day"], result["size"], result["seed"]): result for result in baseline.get("results", [])
+	}
+	for result in report["results"]:
+		baseline_result = baseline_results.get((result["day"], result["size"], result["seed"]))
+		if baseline_result is None:
+			continue
+		result["baseline_total_seconds"] = baseline_result["total_seconds"]
+		result["speedup"] = baseline_result["total_seconds"] / result["total_seconds"]
+	report["baseline_commit"] = baseline.get("commit")
+	return report
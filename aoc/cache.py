@@ -0,0 +1,320 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable
+
+import numpy as np
+
+DEFAULT_CACHE_MAX_BYTES = 1 << 30
+HASH_CHUNK_SIZE = 1 << 20
+META_FILE_NAME = "meta.json"
+COLUMN_FILE_SUFFIX = ".npy"
+
+
+@dataclass
+class SnapshotFormat:
+	"""
+	Class describing how parsed input of a single day is stored as binary columns.
+	:param version: version of the parsed structure and its encoding, changing it invalidates cached snapshots
+	:param encode: function converting parsed input into a dictionary of columns and a JSON-serializable meta dictionary
+	:param decode: function rebuilding parsed input from the day module, the columns and the meta dictionary
+	"""
+	version: int
+	encode: Callable[[Any], tuple[dict[str, np.ndarray], dict]]
+	decode: Callable[[ModuleType, dict[str, np.ndarray], dict], Any]
+
+
+def _get_offsets(lists: list[list]) -> np.ndarray:
+	"""
+	Helper method returning row offsets of flattened lists, the i-th list spanning offsets[i]:offsets[i + 1].
+	"""
+	offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+	np.cumsum([len(values) for values in lists], out=offsets[1:])
+	return offsets
+
+
+def _to_ragged_columns(lists: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	Helper method storing a list of lists of integers as flat values and row offsets.
+	"""
+	offsets = _get_offsets(lists=lists)
+	values = np.fromiter((value for values in lists for value in values), dtype=np.int64, count=int(offsets[-1]))
+	return values, offsets
+
+
+def _from_ragged_columns(values: np.ndarray, offsets: np.ndarray) -> list[list[int]]:
+	values = values.tolist()
+	offsets = offsets.tolist()
+	return [values[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _encode_day_2(games_table: Any) -> tuple[dict[str, np.ndarray], dict]:
+	return {
+		"ids": games_table.ids,
+		"max_red": games_table.max_red,
+		"max_green": games_table.max_green,
+		"max_blue": games_table.max_blue,
+	}, {}
+
+
+def _decode_day_2(module: ModuleType, columns: dict[str, np.ndarray], meta: dict) -> Any:
+	return module.GamesTable(
+		ids=columns["ids"], max_red=columns["max_red"], max_green=columns["max_green"], max_blue=columns["max_blue"]
+	)
+
+
+def _encode_day_3(parsed: tuple[list, Any]) -> tuple[dict[str, np.ndarray], dict]:
+	part_numbers, gear_index = parsed
+	symbols = [part_number.symbols for part_number in part_numbers]
+	return {
+		"x": np.array([part_number.position.x for part_number in part_numbers], dtype=np.int64),
+		"y": np.array([part_number.position.y for part_number in part_numbers], dtype=np.int64),
+		"length": np.array([part_number.length for part_number in part_numbers], dtype=np.int64),
+		"value": np.array([part_number.value for part_number in part_numbers], dtype=np.int64),
+		"symbol_offsets": _get_offsets(lists=symbols),
+		"symbol_x": np.array([symbol.position.x for row in symbols for symbol in row], dtype=np.int64),
+		"symbol_y": np.array([symbol.position.y for row in symbols for symbol in row], dtype=np.int64),
+		"symbol_value": np.array([ord(symbol.value) for row in symbols for symbol in row], dtype=np.uint32),
+	}, {"width": gear_index.width}
+
+
+def _decode_day_3(module: ModuleType, columns: dict[str, np.ndarray], meta: dict) -> Any:
+	symbols_x = columns["symbol_x"].tolist()
+	symbols_y = columns["symbol_y"].tolist()
+	symbols_value = columns["symbol_value"].tolist()
+	symbol_offsets = columns["symbol_offsets"].tolist()
+	gear_index = module.GearIndex(width=meta["width"])
+	part_numbers = []
+	for idx, (x, y, length, value) in enumerate(zip(
+			columns["x"].tolist(), columns["y"].tolist(), columns["length"].tolist(), columns["value"].tolist()
+	)):
+		part_numbers.append(module.PartNumber(
+			position=module.Point(x=x, y=y),
+			length=length,
+			value=value,
+			symbols=[
+				module.Symbol(position=module.Point(x=symbols_x[jdx], y=symbols_y[jdx]), value=chr(symbols_value[jdx]))
+				for jdx in range(symbol_offsets[idx], symbol_offsets[idx + 1])
+			]
+		))
+		gear_index.add_part_number(part_number=part_numbers[-1])
+	return part_numbers, gear_index
+
+
+def _encode_day_4(cards: list) -> tuple[dict[str, np.ndarray], dict]:
+	winning_values, winning_offsets = _to_ragged_columns([card.winning_numbers for card in cards])
+	guessed_values, guessed_offsets = _to_ragged_columns([card.guessed_numbers for card in cards])
+	return {
+		"ids": np.array([card.id for card in cards], dtype=np.int64),
+		"winning_values": winning_values,
+		"winning_offsets": winning_offsets,
+		"guessed_values": guessed_values,
+		"guessed_offsets": guessed_offsets,
+	}, {}
+
+
+def _decode_day_4(module: ModuleType, columns: dict[str, np.ndarray], meta: dict) -> Any:
+	return [
+		module.Card(id=card_id, winning_numbers=winning_numbers, guessed_numbers=guessed_numbers)
+		for card_id, winning_numbers, guessed_numbers in zip(
+			columns["ids"].tolist(),
+			_from_ragged_columns(values=columns["winning_values"], offsets=columns["winning_offsets"]),
+			_from_ragged_columns(values=columns["guessed_values"], offsets=columns["guessed_offsets"])
+		)
+	]
+
+
+def _encode_day_5(almanac: Any) -> tuple[dict[str, np.ndarray], dict]:
+	intervals = [conversion.intervals for conversion in almanac.conversions]
+	return {
+		"seeds": np.array(almanac.seeds, dtype=np.int64),
+		"interval_offsets": _get_offsets(lists=intervals),
+		"source": np.array([interval.source for row in intervals for interval in row], dtype=np.int64),
+		"target": np.array([interval.target for row in intervals for interval in row], dtype=np.int64),
+		"step": np.array([interval.step for row in intervals for interval in row], dtype=np.int64),
+	}, {"rules": [[conversion.rule.convert_from, conversion.rule.convert_to] for conversion in almanac.conversions]}
+
+
+def _decode_day_5(module: ModuleType, columns: dict[str, np.ndarray], meta: dict) -> Any:
+	sources = columns["source"].tolist()
+	targets = columns["target"].tolist()
+	steps = columns["step"].tolist()
+	interval_offsets = columns["interval_offsets"].tolist()
+	conversions = [
+		module.Conversion(
+			rule=module.ConversionRule(
+				convert_from=convert_from,
+				convert_to=convert_to,
+				conversion_regex=module.CONVERSION_REGEX[f"{convert_from}_to_{convert_to}"]
+			),
+			intervals=[
+				module.Interval(source=sources[idx], target=targets[idx], step=steps[idx])
+				for idx in range(interval_offsets[rule_idx], interval_offsets[rule_idx + 1])
+			]
+		) for rule_idx, (convert_from, convert_to) in enumerate(meta["rules"])
+	]
+	return module.Almanac(seeds=columns["seeds"].tolist(), conversions=conversions)
+
+
+def _encode_day_7(hands_table: Any) -> tuple[dict[str, np.ndarray], dict]:
+	return {
+		"packed_hands": hands_table.packed_hands,
+		"packed_hands_with_jokers": hands_table.packed_hands_with_jokers,
+		"bids": hands_table.bids,
+	}, {}
+
+
+def _decode_day_7(module: ModuleType, columns: dict[str, np.ndarray], meta: dict) -> Any:
+	return module.HandsTable(
+		packed_hands=columns["packed_hands"],
+		packed_hands_with_jokers=columns["packed_hands_with_jokers"],
+		bids=columns["bids"]
+	)
+
+
+def _encode_day_8(input_map: Any) -> tuple[dict[str, np.ndarray], dict]:
+	node_names = list(input_map.network.keys())
+	node_ids = {node_name: node_id for node_id, node_name in enumerate(node_names)}
+	undeclared_nodes = {
+		neighbour for neighbours in input_map.network.values() for neighbour in neighbours if neighbour not in node_ids
+	}
+	if len(undeclared_nodes) > 0:
+		raise ValueError(f"Neighbours {sorted(undeclared_nodes)} are not declared as nodes")
+	return {
+		"node_names": np.array(node_names, dtype=str),
+		"left": np.array([node_ids[left] for left, _ in input_map.network.values()], dtype=np.int64),
+		"right": np.array([node_ids[right] for _, right in input_map.network.values()], dtype=np.int64),
+	}, {"instruction": input_map.instruction}
+
+
+def _decode_day_8(module: ModuleType, columns: dict[str, np.ndarray], meta: dict) -> Any:
+	node_names = columns["node_names"].tolist()
+	return module.Map(
+		instruction=meta["instruction"],
+		network={
+			node_name: (node_names[left], node_names[right])
+			for node_name, left, right in zip(node_names, columns["left"].tolist(), columns["right"].tolist())
+		}
+	)
+
+
+SNAPSHOT_FORMATS = {
+	2: SnapshotFormat(version=1, encode=_encode_day_2, decode=_decode_day_2),
+	3: SnapshotFormat(version=1, encode=_encode_day_3, decode=_decode_day_3),
+	4: SnapshotFormat(version=1, encode=_encode_day_4, decode=_decode_day_4),
+	5: SnapshotFormat(version=1, encode=_encode_day_5, decode=_decode_day_5),
+	7: SnapshotFormat(version=1, encode=_encode_day_7, decode=_decode_day_7),
+	8: SnapshotFormat(version=1, encode=_encode_day_8, decode=_decode_day_8),
+}
+
+
+def get_file_hash(path: str) -> str:
+	"""
+	Helper method computing SHA-256 of file content, reading it in chunks.
+	:param path: path to the file
+	:return: hexadecimal digest
+	"""
+	file_hash = hashlib.sha256()
+	with open(path, "rb") as f:
+		while chunk := f.read(HASH_CHUNK_SIZE):
+			file_hash.update(chunk)
+	return file_hash.hexdigest()
+
+
+class ParsedInputCache:
+	"""
+	Cache of parsed inputs stored as binary snapshots. Every snapshot is a directory with one .npy file per column and
+	a meta.json file, named after the day, the snapshot format version and the hash of the input content. Columns are
+	memory-mapped on load. Directory modification time marks the last use, the least recently used snapshots are removed
+	once the total size of the cache exceeds the limit.
+	"""
+
+	def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+		self.cache_dir = cache_dir
+		self.max_bytes = max_bytes
+		os.makedirs(cache_dir, exist_ok=True)
+
+	@staticmethod
+	def is_supported(day: int) -> bool:
+		return day in SNAPSHOT_FORMATS
+
+	def get_entry_dir(self, day: int, input_path: str) -> str:
+		"""
+		Method returning the directory of the snapshot for given day and input file.
+		:param day: day number
+		:param input_path: path to the input file
+		:return: path to the snapshot directory
+		"""
+		return os.path.join(
+			self.cache_dir, f"day{day}-v{SNAPSHOT_FORMATS[day].version}-{get_file_hash(path=input_path)}"
+		)
+
+	def load(self, module: ModuleType, day: int, input_path: str) -> Any | None:
+		"""
+		Method loading parsed input from the cache.
+		:param module: solution module of the day, providing classes of the parsed input
+		:param day: day number
+		:param input_path: path to the input file
+		:return: parsed input or None if there is no snapshot of the input
+		"""
+		entry_dir = self.get_entry_dir(day=day, input_path=input_path)
+		if not os.path.isdir(entry_dir):
+			return None
+		with open(os.path.join(entry_dir, META_FILE_NAME), "r") as f:
+			meta = json.load(f)
+		columns = {
+			file_name[:-len(COLUMN_FILE_SUFFIX)]: np.load(os.path.join(entry_dir, file_name), mmap_mode="r")
+			for file_name in os.listdir(entry_dir) if file_name.endswith(COLUMN_FILE_SUFFIX)
+		}
+		os.utime(entry_dir)
+		return SNAPSHOT_FORMATS[day].decode(module, columns, meta)
+
+	def store(self, day: int, input_path: str, parsed: Any):
+		"""
+		Method storing parsed input in the cache, then evicting least recently used snapshots if needed. The snapshot
+		is written to a temporary directory first and renamed, so a partially written snapshot is never loaded. Parsed
+		inputs the snapshot format cannot represent, e.g. day 8 maps referencing undeclared nodes, are not stored.
+		:param day: day number
+		:param input_path: path to the input file
+		:param parsed: parsed input
+		"""
+		entry_dir = self.get_entry_dir(day=day, input_path=input_path)
+		try:
+			columns, meta = SNAPSHOT_FORMATS[day].encode(parsed)
+		except ValueError:
+			return
+		temporary_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+		for name, column in columns.items():
+			np.save(os.path.join(temporary_dir, name + COLUMN_FILE_SUFFIX), np.asarray(column), allow_pickle=False)
+		with open(os.path.join(temporary_dir, META_FILE_NAME), "w") as f:
+			json.dump(meta, f)
+		try:
+			os.rename(temporary_dir, entry_dir)
+		except OSError:  # snapshot stored in the meantime by another process
+			shutil.rmtree(temporary_dir, ignore_errors=True)
+		self.evict(keep=entry_dir)
+
+	def evict(self, keep: str | None = None):
+		"""
+		Method removing least recently used snapshots until the cache fits into the size limit.
+		:param keep: snapshot directory which must not be removed
+		"""
+		entries = []
+		for entry_name in os.listdir(self.cache_dir):
+			entry_dir = os.path.join(self.cache_dir, entry_name)
+			if entry_name.startswith(".") or not os.path.isdir(entry_dir):
+				continue
+			entry_size = sum(os.path.getsize(os.path.join(entry_dir, file_name)) for file_name in os.listdir(entry_dir))
+			entries.append((os.path.getmtime(entry_dir), entry_dir, entry_size))
+		total_size = sum(entry_size for _, _, entry_size in entries)
+		for _, entry_dir, entry_size in sorted(entries):
+			if total_size <= self.max_bytes:
+				break
+			if entry_dir == keep:
+				continue
+			shutil.rmtree(entry_dir, ignore_errors=True)
+			total_size -= entry_size
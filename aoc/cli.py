@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import tempfile
+
+from aoc.benchmark import BENCHMARK_TIERS, benchmark_parsers, compare_reports, run_benchmark
+from aoc.cache import DEFAULT_CACHE_MAX_BYTES, ParsedInputCache
+from aoc.profiling import to_collapsed_stacks
+from aoc.runner import discover_days, parse_days, run_days
+
+
+def _write_report(report: dict, output: str | None):
+	report_json = json.dumps(report, indent=2)
+	if output is None:
+		print(report_json)
+	else:
+		with open(output, "w") as f:
+			f.write(report_json + "\n")
+
+
+def main(argv: list[str] | None = None):
+	parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2023 solutions runner")
+	subparsers = parser.add_subparsers(dest="command", required=True)
+
+	run_parser = subparsers.add_parser("run", help="run selected days and report answers with timings as JSON")
+	run_parser.add_argument("days", nargs="?", default=None, help="days to run, e.g. 1-9 or 1,3,5-7 (default: all)")
+	run_parser.add_argument("--input-dir", default=None, help="directory with day<N>/input.txt files")
+	run_parser.add_argument(
+		"--parallel", nargs="?", type=int, const=os.cpu_count(), default=None,
+		help="run days in a pool of processes (default size: number of CPUs)"
+	)
+	run_parser.add_argument("--output", default=None, help="path to the JSON report (default: standard output)")
+	run_parser.add_argument(
+		"--cache-dir", default=None, help="directory of binary snapshots of parsed inputs (default: no caching)"
+	)
+	run_parser.add_argument(
+		"--cache-max-bytes", type=int, default=DEFAULT_CACHE_MAX_BYTES,
+		help="size limit of the cache, least recently used snapshots are removed above it"
+	)
+	run_parser.add_argument(
+		"--profile", action="store_true", help="measure calls of every function of the day solutions"
+	)
+	run_parser.add_argument(
+		"--profile-memory", action="store_true", help="measure peak memory of every call as well (implies --profile)"
+	)
+	run_parser.add_argument(
+		"--collapsed-stacks", default=None,
+		help="path to a flame graph compatible file with self times of call stacks in microseconds (implies --profile)"
+	)
+
+	bench_parser = subparsers.add_parser("bench", help="benchmark selected days on synthetic inputs")
+	bench_parser.add_argument("days", nargs="?", default=None, help="days to benchmark, e.g. 1-9 (default: all)")
+	bench_parser.add_argument(
+		"--tiers", default="small", help=f"comma separated size tiers out of: {', '.join(BENCHMARK_TIERS[1])}"
+	)
+	bench_parser.add_argument("--size", type=int, default=None, help="explicit input size used instead of tiers")
+	bench_parser.add_argument("--seed", type=int, default=0, help="seed of the input generators")
+	bench_parser.add_argument(
+		"--work-dir", default=os.path.join(tempfile.gettempdir(), "aoc_benchmark"),
+		help="directory where generated inputs are kept and reused"
+	)
+	bench_parser.add_argument(
+		"--parsers", action="store_true",
+		help="compare parsers built on the shared integer tokenizer with the original ones instead"
+	)
+	bench_parser.add_argument("--baseline", default=None, help="earlier JSON report to compare the results against")
+	bench_parser.add_argument("--output", default=None, help="path to the JSON report (default: standard output)")
+
+	args = parser.parse_args(argv)
+	available_days = discover_days()
+	days = available_days if args.days is None else parse_days(days_spec=args.days)
+	missing_days = [day for day in days if day not in available_days]
+	if len(missing_days) > 0:
+		parser.error(f"no solution found for days: {', '.join(map(str, missing_days))}")
+
+	if args.command == "run":
+		cache = None if args.cache_dir is None else ParsedInputCache(
+			cache_dir=args.cache_dir, max_bytes=args.cache_max_bytes
+		)
+		report = run_days(
+			days=days, input_dir=args.input_dir, workers=args.parallel, cache=cache,
+			profile=args.profile or args.collapsed_stacks is not None, profile_memory=args.profile_memory
+		)
+		if args.collapsed_stacks is not None:
+			with open(args.collapsed_stacks, "w") as f:
+				for result in report["days"]:
+					lines = to_collapsed_stacks(stacks=result["profile"]["stacks"], prefix=f"day{result['day']}")
+					f.writelines(line + "\n" for line in lines)
+		_write_report(report=report, output=args.output)
+		return
+	missing_generators = [day for day in days if day not in BENCHMARK_TIERS]
+	if len(missing_generators) > 0:
+		parser.error(f"no input generator for days: {', '.join(map(str, missing_generators))}")
+	tiers = [tier.strip() for tier in args.tiers.split(",")]
+	if args.parsers:
+		report = benchmark_parsers(days=days, tiers=tiers, work_dir=args.work_dir, size=args.size, seed=args.seed)
+		_write_report(report=report, output=args.output)
+		return
+	report = run_benchmark(days=days, tiers=tiers, work_dir=args.work_dir, size=args.size, seed=args.seed)
+	if args.baseline is not None:
+		with open(args.baseline, "r") as f:
+			report = compare_reports(baseline=json.load(f), report=report)
+	_write_report(report=report, output=args.output)
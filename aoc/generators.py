@@ -0,0 +1,216 @@
+import random
+from typing import Callable
+
+SPELLED_DIGITS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+CUBES_COLORS = ["red", "green", "blue"]
+SCHEMATIC_SYMBOLS = "*#+$/=%@&-"
+CARDS = "AKQJT98765432"
+NODE_NAME_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALMANAC_SECTIONS = [
+	"seed-to-soil", "soil-to-fertilizer", "fertilizer-to-water", "water-to-light",
+	"light-to-temperature", "temperature-to-humidity", "humidity-to-location"
+]
+ALMANAC_VALUES_LIMIT = 1 << 32
+# inner node names may not end with A or Z, which are reserved for starting and terminal nodes
+INNER_NODE_LAST_CHARS = NODE_NAME_CHARS.replace("A", "").replace("Z", "")
+MAX_DAY_8_NODES = len(NODE_NAME_CHARS) ** 2 * len(INNER_NODE_LAST_CHARS)
+WRITE_BATCH_SIZE = 10_000
+# bumped whenever generated inputs change, so that cached inputs of older generators are not reused
+GENERATORS_VERSION = 1
+
+
+def _write_lines(path: str, lines_count: int, get_line: Callable[[int], str]):
+	"""
+	Helper method writing generated lines in batches, so that inputs much larger than memory can be produced.
+	:param path: path to the output file
+	:param lines_count: number of lines
+	:param get_line: function returning a line (without newline) for given line index
+	"""
+	with open(path, "w") as f:
+		for batch_start in range(0, lines_count, WRITE_BATCH_SIZE):
+			batch_end = min(batch_start + WRITE_BATCH_SIZE, lines_count)
+			f.write("\n".join(get_line(idx) for idx in range(batch_start, batch_end)))
+			if batch_end < lines_count:
+				f.write("\n")
+
+
+def generate_day_1(path: str, size: int, seed: int = 0):
+	"""
+	Generates size calibration lines mixing letters, literal digits and spelled-out digits, each with at least one digit.
+	"""
+	generator = random.Random(seed)
+	tokens = list("abcdefghijklmnopqrstuvwxyz") * 2 + list("123456789") + SPELLED_DIGITS
+
+	def get_line(_: int) -> str:
+		line = [generator.choice(tokens) for _ in range(generator.randint(2, 12))]
+		line.insert(generator.randint(0, len(line)), str(generator.randint(1, 9)))
+		return "".join(line)
+
+	_write_lines(path=path, lines_count=size, get_line=get_line)
+
+
+def generate_day_2(path: str, size: int, seed: int = 0):
+	"""
+	Generates size games with one to six cubes sets each.
+	"""
+	generator = random.Random(seed)
+
+	def get_line(idx: int) -> str:
+		cubes_sets = []
+		for _ in range(generator.randint(1, 6)):
+			colors = generator.sample(CUBES_COLORS, generator.randint(1, 3))
+			cubes_sets.append(", ".join(f"{generator.randint(1, 20)} {color}" for color in colors))
+		return f"Game {idx + 1}: " + "; ".join(cubes_sets)
+
+	_write_lines(path=path, lines_count=size, get_line=get_line)
+
+
+def generate_day_3(path: str, size: int, seed: int = 0):
+	"""
+	Generates a size x size schematic with numbers of up to three digits and scattered symbols.
+	"""
+	generator = random.Random(seed)
+
+	def get_line(_: int) -> str:
+		line = []
+		while len(line) < size:
+			roll = generator.random()
+			if roll < 0.15:
+				line.extend(str(generator.randint(1, 999)))
+			elif roll < 0.22:
+				line.append(generator.choice(SCHEMATIC_SYMBOLS))
+			else:
+				line.append(".")
+			if len(line) < size:
+				line.append(".")
+		return "".join(line[:size])
+
+	_write_lines(path=path, lines_count=size, get_line=get_line)
+
+
+def generate_day_4(path: str, size: int, seed: int = 0):
+	"""
+	Generates size scratchcards with 10 winning and 25 guessed numbers each. Most cards have no matches, otherwise the
+	number of won copies would grow exponentially with the number of cards.
+	"""
+	generator = random.Random(seed)
+	card_id_width = len(str(size))
+
+	def get_line(idx: int) -> str:
+		numbers = generator.sample(range(1, 100), 35)
+		winning_numbers = numbers[:10]
+		matches_count = generator.randint(1, 3) if generator.random() < 0.2 else 0
+		guessed_numbers = generator.sample(winning_numbers, matches_count) + numbers[10:]
+		guessed_numbers = guessed_numbers[:25]
+		generator.shuffle(guessed_numbers)
+		return (
+			f"Card {idx + 1:>{card_id_width}}: "
+			+ " ".join(f"{number:>2}" for number in winning_numbers)
+			+ " | "
+			+ " ".join(f"{number:>2}" for number in guessed_numbers)
+		)
+
+	_write_lines(path=path, lines_count=size, get_line=get_line)
+
+
+def generate_day_5(path: str, size: int, seed: int = 0):
+	"""
+	Generates an almanac with size intervals per conversion and size seed ranges spanning the whole values range.
+	"""
+	generator = random.Random(seed)
+	seeds = []
+	for _ in range(size):
+		seed_start = generator.randrange(ALMANAC_VALUES_LIMIT)
+		seeds += [seed_start, generator.randint(1, ALMANAC_VALUES_LIMIT - seed_start)]
+	sections = [f"seeds: {' '.join(map(str, seeds))}"]
+	for section_name in ALMANAC_SECTIONS:
+		cut_points = sorted(generator.sample(range(1, ALMANAC_VALUES_LIMIT), size))
+		intervals = [
+			f"{generator.randrange(ALMANAC_VALUES_LIMIT - (end - start))} {start} {end - start}"
+			for start, end in zip([0] + cut_points, cut_points)
+		]
+		generator.shuffle(intervals)
+		sections.append(f"{section_name} map:\n" + "\n".join(intervals))
+	with open(path, "w") as f:
+		f.write("\n\n".join(sections))
+
+
+def generate_day_6(path: str, size: int, seed: int = 0):
+	"""
+	Generates size races. Part two concatenates all numbers into a single one, so the size should stay below roughly
+	a thousand races, which keeps the concatenated numbers within the default int conversion limit.
+	"""
+	generator = random.Random(seed)
+	times = [generator.randint(10, 99) for _ in range(size)]
+	distances = [generator.randint(0, time * time // 4 - 1) for time in times]
+	with open(path, "w") as f:
+		f.write(f"Time: {' '.join(map(str, times))}\nDistance: {' '.join(map(str, distances))}\n")
+
+
+def generate_day_7(path: str, size: int, seed: int = 0):
+	"""
+	Generates size hands with random cards and bids.
+	"""
+	generator = random.Random(seed)
+	_write_lines(
+		path=path,
+		lines_count=size,
+		get_line=lambda _: f"{''.join(generator.choices(CARDS, k=5))} {generator.randint(1, 1000)}"
+	)
+
+
+def generate_day_8(path: str, size: int, seed: int = 0):
+	"""
+	Generates a network of size nodes (limited by three-character node names) made of rings. Every ring is
+	entered from a node ending with A and has a single node ending with Z, ring AAA contains ZZZ. Left and right
+	neighbours of a node are equal, so walks do not depend on the random instruction.
+	"""
+	generator = random.Random(seed)
+	size = min(size, MAX_DAY_8_NODES)
+	rings_count = max(1, min(6, size // 50))
+	names = set()
+	while len(names) < size - 2 * rings_count:
+		names.add("".join(generator.choices(NODE_NAME_CHARS, k=2)) + generator.choice(INNER_NODE_LAST_CHARS))
+	inner_names = list(names)
+	generator.shuffle(inner_names)
+	starts = ["AAA"] + [f"{idx:02}A" for idx in range(1, rings_count)]
+	terminals = ["ZZZ"] + [f"{idx:02}Z" for idx in range(1, rings_count)]
+	network = {}
+	ring_size = len(inner_names) // rings_count
+	for ring_idx, (start, terminal) in enumerate(zip(starts, terminals)):
+		ring_end = len(inner_names) if ring_idx == rings_count - 1 else (ring_idx + 1) * ring_size
+		ring = inner_names[ring_idx * ring_size:ring_end] + [terminal]
+		network[start] = ring[0]
+		for node, next_node in zip(ring, ring[1:] + ring[:1]):
+			network[node] = next_node
+	lines = [f"{node} = ({next_node}, {next_node})" for node, next_node in network.items()]
+	generator.shuffle(lines)
+	with open(path, "w") as f:
+		f.write("".join(generator.choices("LR", k=generator.randint(200, 300))) + "\n\n" + "\n".join(lines) + "\n")
+
+
+def generate_day_9(path: str, size: int, seed: int = 0):
+	"""
+	Generates size histories of 21 values of random polynomials of degree up to 10.
+	"""
+	generator = random.Random(seed)
+
+	def get_line(_: int) -> str:
+		coefficients = [generator.randint(-5, 5) for _ in range(generator.randint(1, 11))]
+		values = [sum(c * x ** power for power, c in enumerate(coefficients)) for x in range(21)]
+		return " ".join(map(str, values))
+
+	_write_lines(path=path, lines_count=size, get_line=get_line)
+
+
+GENERATORS: dict[int, Callable[[str, int, int], None]] = {
+	1: generate_day_1,
+	2: generate_day_2,
+	3: generate_day_3,
+	4: generate_day_4,
+	5: generate_day_5,
+	6: generate_day_6,
+	7: generate_day_7,
+	8: generate_day_8,
+	9: generate_day_9,
+}
@@ -0,0 +1,189 @@
+import functools
+import inspect
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+# collapsed stacks store self times as integer microseconds, which flame graph tools expect as sample counts
+COLLAPSED_STACK_UNIT_SECONDS = 1e-6
+
+
+@dataclass
+class FunctionStats:
+	"""
+	Class representing aggregated measurements of a single instrumented function.
+	:param calls: number of calls
+	:param wall_seconds: inclusive wall time, recursive calls are counted once
+	:param cpu_seconds: inclusive CPU time of the process, recursive calls are counted once
+	:param peak_memory_bytes: highest memory allocated during a single call, measured only with memory tracing
+	"""
+	calls: int = 0
+	wall_seconds: float = 0.0
+	cpu_seconds: float = 0.0
+	peak_memory_bytes: int = 0
+
+
+@dataclass
+class _Frame:
+	name: str
+	stack: str
+	start_wall: float
+	start_cpu: float
+	start_memory: int = 0
+	peak_memory: int = 0
+	children_wall: float = 0.0
+
+
+@dataclass
+class Profiler:
+	"""
+	Class collecting call counts, wall and CPU times and optionally peak memory of instrumented functions, together with
+	self wall time of every call stack. Functions are instrumented only inside instrument(), so solutions run at full
+	speed when profiling is not requested.
+	:param trace_memory: whether peak memory of every call is measured with tracemalloc, which slows allocations down
+	:param functions: measurements by function name
+	:param stacks: self wall time in seconds by call stack, names separated with semicolons
+	"""
+	trace_memory: bool = False
+	functions: dict[str, FunctionStats] = field(default_factory=dict)
+	stacks: dict[str, float] = field(default_factory=dict)
+	_frames: list[_Frame] = field(default_factory=list)
+	_active_calls: dict[str, int] = field(default_factory=dict)
+
+	def _enter(self, name: str):
+		stack = name if len(self._frames) == 0 else f"{self._frames[-1].stack};{name}"
+		frame = _Frame(name=name, stack=stack, start_wall=time.perf_counter(), start_cpu=time.process_time())
+		if self.trace_memory:
+			frame.start_memory, peak_memory = tracemalloc.get_traced_memory()
+			# the peak is reset for every call, so the enclosing call keeps the peak reached so far
+			if len(self._frames) > 0:
+				self._frames[-1].peak_memory = max(self._frames[-1].peak_memory, peak_memory)
+			tracemalloc.reset_peak()
+		self._active_calls[name] = self._active_calls.get(name, 0) + 1
+		self._frames.append(frame)
+
+	def _exit(self):
+		frame = self._frames.pop()
+		wall_time = time.perf_counter() - frame.start_wall
+		cpu_time = time.process_time() - frame.start_cpu
+		stats = self.functions.setdefault(frame.name, FunctionStats())
+		stats.calls += 1
+		self._active_calls[frame.name] -= 1
+		if self._active_calls[frame.name] == 0:
+			stats.wall_seconds += wall_time
+			stats.cpu_seconds += cpu_time
+		self.stacks[frame.stack] = self.stacks.get(frame.stack, 0.0) + wall_time - frame.children_wall
+		if len(self._frames) > 0:
+			self._frames[-1].children_wall += wall_time
+		if self.trace_memory:
+			peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+			stats.peak_memory_bytes = max(stats.peak_memory_bytes, peak_memory - frame.start_memory)
+			if len(self._frames) > 0:
+				self._frames[-1].peak_memory = max(self._frames[-1].peak_memory, peak_memory)
+
+	@contextmanager
+	def section(self, name: str) -> Iterator[None]:
+		"""
+		Context manager measuring a block of code as if it was a call of an instrumented function.
+		:param name: name of the section
+		"""
+		self._enter(name=name)
+		try:
+			yield
+		finally:
+			self._exit()
+
+	def wrap(self, function: Callable, name: str | None = None) -> Callable:
+		"""
+		Decorator measuring every call of a function.
+		:param function: function to instrument
+		:param name: name under which the function is reported, its qualified name by default
+		:return: instrumented function
+		"""
+		name = name if name is not None else function.__qualname__
+
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			self._enter(name=name)
+			try:
+				return function(*args, **kwargs)
+			finally:
+				self._exit()
+
+		return wrapper
+
+	@contextmanager
+	def instrument(self, module: ModuleType) -> Iterator[None]:
+		"""
+		Context manager replacing functions defined in a module, and methods of classes defined there, with instrumented
+		versions and restoring the originals on exit. Functions call each other through module globals and class
+		attributes, so calls of inner helpers are measured too. Special methods such as comparisons are not instrumented.
+		:param module: module to instrument, e.g. a day solution module
+		"""
+		originals = []
+		for owner, attribute_name, value, function, name in _get_instrumentable_attributes(module=module):
+			instrumented = self.wrap(function=function, name=name)
+			if isinstance(value, (staticmethod, classmethod)):
+				instrumented = type(value)(instrumented)
+			originals.append((owner, attribute_name, value))
+			setattr(owner, attribute_name, instrumented)
+		if self.trace_memory and not tracemalloc.is_tracing():
+			tracemalloc.start()
+			stop_tracing = True
+		else:
+			stop_tracing = False
+		try:
+			yield
+		finally:
+			for owner, attribute_name, value in originals:
+				setattr(owner, attribute_name, value)
+			if stop_tracing:
+				tracemalloc.stop()
+
+	def to_json(self) -> dict:
+		"""
+		Method returning measurements as a JSON-serializable dictionary.
+		:return: dictionary with measurements by function and self times by call stack
+		"""
+		return {
+			"functions": {name: asdict(stats) for name, stats in self.functions.items()},
+			"stacks": dict(self.stacks),
+		}
+
+
+def _get_instrumentable_attributes(module: ModuleType) -> Iterator[tuple[Any, str, Any, Callable, str]]:
+	"""
+	Helper method finding functions defined in a module and methods of classes defined there.
+	:param module: module to search
+	:return: iterator over (owner, attribute name, attribute value, function, reported name)
+	"""
+	for attribute_name, value in list(vars(module).items()):
+		if getattr(value, "__module__", None) != module.__name__:
+			continue
+		if inspect.isclass(value):
+			for method_name, method in list(vars(value).items()):
+				if method_name.startswith("__"):
+					continue
+				function = method.__func__ if isinstance(method, (staticmethod, classmethod)) else method
+				if callable(function) and getattr(function, "__module__", None) == module.__name__:
+					yield value, method_name, method, function, f"{value.__name__}.{method_name}"
+		elif callable(value):
+			yield module, attribute_name, value, value, attribute_name
+
+
+def to_collapsed_stacks(stacks: dict[str, float], prefix: str | None = None) -> list[str]:
+	"""
+	Method formatting self times by call stack as collapsed stack lines accepted by flame graph tools.
+	:param stacks: self wall time in seconds by call stack
+	:param prefix: frame prepended to every stack, e.g. day name
+	:return: list of lines "frame;frame;frame microseconds"
+	"""
+	lines = []
+	for stack, seconds in stacks.items():
+		samples = round(seconds / COLLAPSED_STACK_UNIT_SECONDS)
+		if samples > 0:
+			lines.append(f"{stack if prefix is None else f'{prefix};{stack}'} {samples}")
+	return lines
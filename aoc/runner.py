@@ -0,0 +1,258 @@
+import functools
+import importlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, ContextManager
+
+from aoc.cache import ParsedInputCache
+from aoc.profiling import Profiler
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY_DIR_REGEX = re.compile(r"day(\d+)")
+INPUT_FILE_NAME = "input.txt"
+
+
+@dataclass
+class DaySolution:
+	"""
+	Class representing a uniform interface to a single day solution.
+	:param day: day number
+	:param parse: function loading input from given path
+	:param part_one: function solving part one for parsed input
+	:param part_two: function solving part two for parsed input
+	"""
+	day: int
+	parse: Callable[[str], Any]
+	part_one: Callable[[Any], Any]
+	part_two: Callable[[Any], Any]
+
+
+def _load_day_6_races(module: ModuleType, path: str) -> tuple[list[int], list[int]]:
+	if os.path.exists(path):
+		return module.parse_input(path=path)
+	return module.TIME, module.DISTANCE
+
+
+DAY_ADAPTERS: dict[int, Callable[[ModuleType], DaySolution]] = {
+	1: lambda module: DaySolution(
+		day=1,
+		parse=module.parse_input,
+		part_one=lambda parsed: module.part_one(calibration_values=parsed),
+		part_two=lambda parsed: module.part_two(calibration_values=parsed)
+	),
+	2: lambda module: DaySolution(
+		day=2,
+		parse=module.parse_input,
+		part_one=lambda parsed: module.part_one(games=parsed),
+		part_two=lambda parsed: module.part_two(games=parsed)
+	),
+	3: lambda module: DaySolution(
+		day=3,
+		parse=module.parse_input_with_gear_index,
+		part_one=lambda parsed: module.part_one(part_numbers=parsed[0]),
+		part_two=lambda parsed: module.part_two(part_numbers=parsed[0], gear_index=parsed[1])
+	),
+	4: lambda module: DaySolution(
+		day=4,
+		parse=module.parse_input,
+		part_one=lambda parsed: module.part_one(cards=parsed),
+		part_two=lambda parsed: module.part_two(cards=parsed)
+	),
+	5: lambda module: DaySolution(
+		day=5,
+		parse=module.parse_almanac,
+		part_one=lambda parsed: module.part_one(almanac=parsed),
+		part_two=lambda parsed: module.part_two(almanac=parsed)
+	),
+	6: lambda module: DaySolution(
+		day=6,
+		parse=lambda path: _load_day_6_races(module=module, path=path),
+		part_one=lambda parsed: module.part_one(time=parsed[0], distance=parsed[1]),
+		part_two=lambda parsed: module.part_two(time=parsed[0], distance=parsed[1])
+	),
+	7: lambda module: DaySolution(
+		day=7,
+		parse=module.parse_hands_table,
+		part_one=lambda parsed: module.part_one(hands=parsed),
+		part_two=lambda parsed: module.part_two(hands=parsed)
+	),
+	8: lambda module: DaySolution(
+		day=8,
+		parse=module.parse_input_graph,
+		part_one=lambda parsed: module.part_one(input_map=parsed, starting_node="AAA", target_node="ZZZ"),
+		part_two=lambda parsed: module.part_two(input_map=parsed)
+	),
+	9: lambda module: DaySolution(
+		day=9,
+		parse=module.parse_input,
+		part_one=lambda parsed: module.part_one(values_history=parsed),
+		part_two=lambda parsed: module.part_two(values_history=parsed)
+	),
+}
+
+
+def discover_days(repository_dir: str = REPOSITORY_DIR) -> list[int]:
+	"""
+	Method finding all day directories containing a solution module.
+	:param repository_dir: path to the repository root
+	:return: sorted list of day numbers
+	"""
+	return sorted(
+		int(match.group(1))
+		for entry in os.listdir(repository_dir)
+		if (match := DAY_DIR_REGEX.fullmatch(entry)) is not None
+		and os.path.isfile(os.path.join(repository_dir, entry, "solution.py"))
+	)
+
+
+def import_day_module(day: int) -> ModuleType:
+	"""
+	Helper method importing the solution module of given day.
+	:param day: day number
+	:return: imported module
+	"""
+	if REPOSITORY_DIR not in sys.path:
+		sys.path.insert(0, REPOSITORY_DIR)
+	return importlib.import_module(f"day{day}.solution")
+
+
+def get_day_solution(day: int) -> DaySolution:
+	"""
+	Method importing a day solution module and wrapping it into the uniform interface. Days without a dedicated adapter
+	are expected to follow solution_template.py, i.e. expose parse_input(path), part_one(parsed), part_two(parsed).
+	:param day: day number
+	:return: day solution
+	"""
+	module = import_day_module(day=day)
+	if day in DAY_ADAPTERS:
+		return DAY_ADAPTERS[day](module)
+	return DaySolution(day=day, parse=module.parse_input, part_one=module.part_one, part_two=module.part_two)
+
+
+def get_input_path(day: int, input_dir: str | None = None) -> str:
+	"""
+	Helper method returning path of the input file for given day, i.e. <input_dir>/day<N>/input.txt. By default inputs
+	are taken from day directories of the repository.
+	:param day: day number
+	:param input_dir: directory with day subdirectories holding input files
+	:return: path to the input file
+	"""
+	return os.path.join(input_dir if input_dir is not None else REPOSITORY_DIR, f"day{day}", INPUT_FILE_NAME)
+
+
+def parse_days(days_spec: str) -> list[int]:
+	"""
+	Helper method parsing days selection such as "1-9" or "1,3,5-7".
+	:param days_spec: days selection
+	:return: sorted list of selected day numbers
+	"""
+	days = set()
+	for days_range in days_spec.split(","):
+		first_day, _, last_day = days_range.strip().partition("-")
+		days.update(range(int(first_day), int(last_day or first_day) + 1))
+	return sorted(days)
+
+
+def _to_json_value(answer: Any) -> Any:
+	return int(answer) if answer is not None and not isinstance(answer, str) else answer
+
+
+def parse_day_input(
+		day_solution: DaySolution, input_path: str, cache: ParsedInputCache | None = None
+) -> tuple[Any, str | None]:
+	"""
+	Method parsing input of a day, loading it from the parsed input cache when possible and storing it there otherwise.
+	:param day_solution: day solution
+	:param input_path: path to the input file
+	:param cache: parsed input cache, input is always parsed from text if not given
+	:return: parsed input and cache status ("hit", "miss" or None if the day is not cached)
+	"""
+	if cache is None or not cache.is_supported(day=day_solution.day):
+		return day_solution.parse(input_path), None
+	parsed = cache.load(module=import_day_module(day=day_solution.day), day=day_solution.day, input_path=input_path)
+	if parsed is not None:
+		return parsed, "hit"
+	parsed = day_solution.parse(input_path)
+	cache.store(day=day_solution.day, input_path=input_path, parsed=parsed)
+	return parsed, "miss"
+
+
+def _get_section(profiler: Profiler | None, name: str) -> ContextManager:
+	# sections are named <phase>, so that they are not mixed up with functions such as part_one
+	return profiler.section(name=f"<{name}>") if profiler is not None else nullcontext()
+
+
+def run_day(
+		day: int, input_path: str, cache: ParsedInputCache | None = None, profile: bool = False,
+		profile_memory: bool = False
+) -> dict:
+	"""
+	Method running both parts of a single day in the current process and measuring time of each phase. With profiling,
+	functions of the day module are instrumented for the duration of the run, otherwise they are left untouched.
+	:param day: day number
+	:param input_path: path to the input file
+	:param cache: parsed input cache
+	:param profile: whether calls of the day module functions are measured
+	:param profile_memory: whether peak memory of every call is measured as well, implies profile
+	:return: dictionary with answers and timings in seconds
+	"""
+	start = time.perf_counter()
+	module = import_day_module(day=day)
+	import_time = time.perf_counter() - start
+	profiler = Profiler(trace_memory=profile_memory) if profile or profile_memory else None
+	with profiler.instrument(module=module) if profiler is not None else nullcontext():
+		day_solution = get_day_solution(day=day)
+		start = time.perf_counter()
+		with _get_section(profiler=profiler, name="parse"):
+			parsed, cache_status = parse_day_input(day_solution=day_solution, input_path=input_path, cache=cache)
+		parse_time = time.perf_counter() - start
+		result = {
+			"day": day,
+			"input": input_path,
+			"import_seconds": import_time,
+			"parse_seconds": parse_time,
+		}
+		if cache is not None:
+			result["cache"] = cache_status
+		for part_name, part in (("part_one", day_solution.part_one), ("part_two", day_solution.part_two)):
+			start = time.perf_counter()
+			with _get_section(profiler=profiler, name=part_name):
+				answer = part(parsed)
+			result[part_name] = {"answer": _to_json_value(answer), "seconds": time.perf_counter() - start}
+	result["total_seconds"] = (
+		import_time + parse_time + result["part_one"]["seconds"] + result["part_two"]["seconds"]
+	)
+	if profiler is not None:
+		result["profile"] = profiler.to_json()
+	return result
+
+
+def run_days(
+		days: list[int], input_dir: str | None = None, workers: int | None = None, cache: ParsedInputCache | None = None,
+		profile: bool = False, profile_memory: bool = False
+) -> dict:
+	"""
+	Method running selected days, either one after another in the current process or in a pool of processes.
+	:param days: list of day numbers
+	:param input_dir: directory with day subdirectories holding input files
+	:param workers: number of processes, days are run in the current process if not given
+	:param cache: parsed input cache
+	:param profile: whether calls of the day module functions are measured
+	:param profile_memory: whether peak memory of every call is measured as well
+	:return: dictionary with results of every day and the total wall time
+	"""
+	input_paths = [get_input_path(day=day, input_dir=input_dir) for day in days]
+	run_day_options = functools.partial(run_day, cache=cache, profile=profile, profile_memory=profile_memory)
+	start = time.perf_counter()
+	if workers is None:
+		results = [run_day_options(day=day, input_path=input_path) for day, input_path in zip(days, input_paths)]
+	else:
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			results = list(executor.map(run_day_options, days, input_paths))
+	return {"days": results, "wall_seconds": time.perf_counter() - start}
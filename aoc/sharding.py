@@ -0,0 +1,42 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+
+def get_shards(path: str, shards_count: int) -> list[tuple[int, int]]:
+	"""
+	Helper method splitting a file into byte ranges of similar size. Every range boundary is moved forward to the
+	beginning of the next line, so no line is split between two ranges.
+	:param path: path to the input file
+	:param shards_count: requested number of ranges
+	:return: list of [start, end) byte ranges covering the whole file
+	"""
+	file_size = os.path.getsize(path)
+	boundaries = [0]
+	with open(path, "rb") as f:
+		for shard_idx in range(1, shards_count):
+			f.seek(max(file_size * shard_idx // shards_count - 1, boundaries[-1]))
+			f.readline()
+			boundaries.append(max(f.tell(), boundaries[-1]))
+	boundaries.append(file_size)
+	return [(start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) if start < end]
+
+
+def solve_parallel(
+		path: str, workers: int, solve_shard: Callable[[str, int, int], tuple[int, int]]
+) -> tuple[int, int]:
+	"""
+	Method computing answers to both parts with a pool of processes. Each process reads and parses its own byte range
+	of the file, only the partial sums are sent back and added up.
+	:param path: path to the input file
+	:param workers: number of processes
+	:param solve_shard: module-level function of a day solution computing partial answers to both parts for the
+	[start, end) byte range of the file, called as solve_shard(path, start, end)
+	:return: answers to part one and part two
+	"""
+	shards = get_shards(path=path, shards_count=workers)
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		partial_sums = list(executor.map(
+			solve_shard, [path] * len(shards), [start for start, _ in shards], [end for _, end in shards]
+		))
+	return sum(sum_one for sum_one, _ in partial_sums), sum(sum_two for _, sum_two in partial_sums)
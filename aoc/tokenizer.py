@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+DIGIT_0 = ord("0")
+DIGIT_9 = ord("9")
+MINUS = ord("-")
+MAX_INT64_DIGITS = 18  # every number of up to 18 digits fits into int64
+
+
+@dataclass
+class IntegerRows:
+	"""
+	Class representing integers parsed from text in a ragged (CSR) layout, the i-th row holding
+	values[offsets[i]:offsets[i + 1]].
+	:param values: int64 array with integers of all rows
+	:param offsets: int64 array of row boundaries, one longer than the number of rows
+	"""
+	values: np.ndarray
+	offsets: np.ndarray
+
+	def __len__(self) -> int:
+		return len(self.offsets) - 1
+
+	def row(self, idx: int) -> np.ndarray:
+		return self.values[self.offsets[idx]:self.offsets[idx + 1]]
+
+	def to_lists(self) -> list[list[int]]:
+		"""
+		Method converting rows to lists of Python integers.
+		:return: list of rows
+		"""
+		values = self.values.tolist()
+		offsets = self.offsets.tolist()
+		return [values[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def tokenize_integers(data: bytes | bytearray | memoryview, separators: bytes = b"\n") -> IntegerRows:
+	"""
+	Method parsing all integers of a text at once, without splitting it into Python strings. Numbers are runs of
+	digits, optionally preceded by a minus sign, any other byte only separates them. Rows are the pieces of the text
+	between separator bytes, as in bytes.split, except that a trailing separator does not start an empty row. Digits
+	are accumulated position by position for all numbers together, so the work is vectorized over the whole text.
+	:param data: text to parse
+	:param separators: bytes ending a row, e.g. b"\n" for one row per line, b"\n:|" to split lines further
+	:return: integers with row offsets
+	"""
+	text = np.frombuffer(data, dtype=np.uint8)
+	is_digit = (text >= DIGIT_0) & (text <= DIGIT_9)
+	is_start = is_digit.copy()
+	is_start[1:] &= ~is_digit[:-1]
+	is_end = is_digit.copy()
+	is_end[:-1] &= ~is_digit[1:]
+	starts = np.flatnonzero(is_start)
+	lengths = np.flatnonzero(is_end) + 1 - starts
+	if len(lengths) > 0 and lengths.max() > MAX_INT64_DIGITS:
+		raise OverflowError(f"numbers longer than {MAX_INT64_DIGITS} digits do not fit into int64")
+	values = np.zeros(len(starts), dtype=np.int64)
+	for digit_idx in range(int(lengths.max(initial=0))):
+		in_number = digit_idx < lengths
+		values[in_number] = values[in_number] * 10 + (text[starts[in_number] + digit_idx] - DIGIT_0)
+	is_negative = np.zeros(len(starts), dtype=bool)
+	has_preceding = starts > 0
+	is_negative[has_preceding] = text[starts[has_preceding] - 1] == MINUS
+	values[is_negative] *= -1
+	separator_positions = np.flatnonzero(np.isin(text, np.frombuffer(separators, dtype=np.uint8)))
+	rows_count = len(separator_positions) + 1
+	if len(text) == 0 or (len(separator_positions) > 0 and separator_positions[-1] == len(text) - 1):
+		rows_count -= 1
+	# row of a number is the number of separators before it
+	rows = np.searchsorted(separator_positions, starts)
+	offsets = np.zeros(rows_count + 1, dtype=np.int64)
+	np.cumsum(np.bincount(rows, minlength=rows_count), out=offsets[1:])
+	return IntegerRows(values=values, offsets=offsets)
@@ -1,3 +1,13 @@
+import argparse
+import os
+import sys
+from typing import Iterator
+
+if __name__ == "__main__":  # run as a script from the day directory, the repository root is not on the path then
+	sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.sharding import solve_parallel  # noqa: E402
+
+CHUNK_SIZE = 1 << 20
 CONVERTING_RULES = {
 	'one': '1',
 	'two': '2',
@@ -9,20 +19,96 @@ CONVERTING_RULES = {
 	'eight': '8',
 	'nine': '9',
 }
+TRIE_TERMINAL = ''
+
+
+def build_trie(words: dict[str, str]) -> dict:
+	"""
+	Helper method building a character trie out of given words. The value assigned to a word is stored in its last
+	node under TRIE_TERMINAL key.
+	:param words: dictionary mapping words to values
+	:return: root node of the trie
+	"""
+	root = {}
+	for word, value in words.items():
+		node = root
+		for char in word:
+			node = node.setdefault(char, {})
+		node[TRIE_TERMINAL] = value
+	return root
+
+
+DIGITS_TRIE = build_trie(CONVERTING_RULES)
+DIGITS_TRIE_REVERSED = build_trie({key[::-1]: value for key, value in CONVERTING_RULES.items()})
+
+
+def get_literal_calibration_value(line: str) -> int:
+	"""
+	Helper method returning a number made of the first and the last literal digit in a line.
+	:param line: input line
+	:return: calibration value of the line
+	"""
+	digits = [char for char in line if char.isdigit()]
+	if len(digits) == 0:
+		raise ValueError
+	return int(digits[0] + digits[-1])
 
 
 def part_one(calibration_values: list[str]) -> int:
-	calibration_sum = 0
-	for line in calibration_values:
-		digits = [char for char in line if char.isdigit()]
-		if len(digits) == 0:
-			raise ValueError
-		else:
-			calibration_sum += int(digits[0] + digits[-1])
-	return calibration_sum
+	return sum(get_literal_calibration_value(line=line) for line in calibration_values)
+
+
+def match_digit(line: str, idx: int, trie: dict, direction: int) -> str | None:
+	"""
+	Helper method checking whether a digit, literal or spelled-out, starts at given index of the line. Spelled-out
+	digits are matched by walking the trie in given direction, so no substrings are created.
+	:param line: input line
+	:param idx: index of the first character to check
+	:param trie: digits trie matching the direction of the walk
+	:param direction: 1 for reading forward, -1 for reading backward
+	:return: matched digit or None
+	"""
+	if line[idx].isdigit():
+		return line[idx]
+	node = trie
+	while 0 <= idx < len(line) and line[idx] in node:
+		node = node[line[idx]]
+		if TRIE_TERMINAL in node:
+			return node[TRIE_TERMINAL]
+		idx += direction
+	return None
+
+
+def get_calibration_value(line: str) -> int:
+	"""
+	Method finding the first and the last digit (literal or spelled-out) in a line. The line is scanned forward until
+	the first match and backward until the last match, hence every character is visited at most once per direction.
+	:param line: input line
+	:return: calibration value of the line
+	"""
+	first_digit = None
+	for idx in range(len(line)):
+		first_digit = match_digit(line=line, idx=idx, trie=DIGITS_TRIE, direction=1)
+		if first_digit is not None:
+			break
+	if first_digit is None:
+		raise ValueError
+	last_digit = None
+	for idx in range(len(line) - 1, -1, -1):
+		last_digit = match_digit(line=line, idx=idx, trie=DIGITS_TRIE_REVERSED, direction=-1)
+		if last_digit is not None:
+			break
+	return int(first_digit + last_digit)
 
 
 def part_two(calibration_values: list[str]) -> int:
+	return sum(get_calibration_value(line=line) for line in calibration_values)
+
+
+def part_two_reference(calibration_values: list[str]) -> int:
+	"""
+	Reference implementation of part two based on replacing spelled-out digits, kept for equivalence checks.
+	"""
 	calibration_sum = 0
 	for line in calibration_values:
 		for key, value in CONVERTING_RULES.items():
@@ -35,8 +121,67 @@ def part_two(calibration_values: list[str]) -> int:
 	return calibration_sum
 
 
-if __name__ == "__main__":
-	with open("./input.txt", "r") as f:
+def parse_input(path: str = "./input.txt") -> list[str]:
+	with open(path, "r") as f:
 		calibration_values = f.readlines()
-	print(f"Part one: {part_one(calibration_values=calibration_values)}")
-	print(f"Part two: {part_two(calibration_values=calibration_values)}")
+	return calibration_values
+
+
+def iterate_lines(path: str, chunk_size: int = CHUNK_SIZE, start: int = 0, end: int | None = None) -> Iterator[str]:
+	"""
+	Generator reading a file in fixed-size binary chunks and yielding its lines. A line split between two chunks is
+	carried over to the next chunk, so only a single chunk and one partial line are kept in memory.
+	:param path: path to the input file
+	:param chunk_size: number of bytes read at once
+	:param start: byte offset of the first line to read
+	:param end: byte offset at which reading stops, end of file by default
+	:return: iterator over lines of the file, without trailing newlines
+	"""
+	remainder = b""
+	with open(path, "rb") as f:
+		f.seek(start)
+		position = start
+		while end is None or position < end:
+			chunk = f.read(chunk_size if end is None else min(chunk_size, end - position))
+			if len(chunk) == 0:
+				break
+			position += len(chunk)
+			lines = (remainder + chunk).split(b"\n")
+			remainder = lines.pop()
+			for line in lines:
+				yield line.decode()
+	if len(remainder) > 0:
+		yield remainder.decode()
+
+
+def solve_stream(path: str, chunk_size: int = CHUNK_SIZE, start: int = 0, end: int | None = None) -> tuple[int, int]:
+	"""
+	Method computing answers to both parts in a single pass over the file (or its byte range), using constant memory.
+	:param path: path to the input file
+	:param chunk_size: number of bytes read at once
+	:param start: byte offset of the first line to process
+	:param end: byte offset at which processing stops, end of file by default
+	:return: answers to part one and part two
+	"""
+	calibration_sum_one = 0
+	calibration_sum_two = 0
+	for line in iterate_lines(path=path, chunk_size=chunk_size, start=start, end=end):
+		calibration_sum_one += get_literal_calibration_value(line=line)
+		calibration_sum_two += get_calibration_value(line=line)
+	return calibration_sum_one, calibration_sum_two
+
+
+def solve_shard(path: str, start: int, end: int) -> tuple[int, int]:
+	return solve_stream(path=path, start=start, end=end)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--workers", type=int, default=1, help="number of processes used to compute the sums")
+	args = parser.parse_args()
+	if args.workers > 1:
+		answer_one, answer_two = solve_parallel(path="./input.txt", workers=args.workers, solve_shard=solve_shard)
+	else:
+		answer_one, answer_two = solve_stream(path="./input.txt")
+	print(f"Part one: {answer_one}")
+	print(f"Part two: {answer_two}")
@@ -1,5 +1,9 @@
+import argparse
 import re
+import time
+import numpy as np
 from dataclasses import dataclass
+from typing import Iterable
 
 
 @dataclass
@@ -16,9 +20,43 @@ class Game:
 	is_valid: bool = True
 
 
+@dataclass
+class GamesTable:
+	"""
+	Columnar representation of games, keeping only the maximal number of cubes of each color shown in a game.
+	:param ids: array of game ids
+	:param max_red: array of maximal red cubes counts
+	:param max_green: array of maximal green cubes counts
+	:param max_blue: array of maximal blue cubes counts
+	"""
+	ids: np.ndarray
+	max_red: np.ndarray
+	max_green: np.ndarray
+	max_blue: np.ndarray
+
+
+@dataclass
+class BudgetIndex:
+	"""
+	Class representing a 3D dominance index over per-game maxima. Each color's distinct maxima are compressed to
+	consecutive coordinates, prefix_sums[r, g, b] holds the sum of ids of games whose compressed maxima are lower than
+	r, g and b respectively.
+	:param red_values: sorted distinct maximal red cubes counts
+	:param green_values: sorted distinct maximal green cubes counts
+	:param blue_values: sorted distinct maximal blue cubes counts
+	:param prefix_sums: 3D array of game ids prefix sums
+	"""
+	red_values: np.ndarray
+	green_values: np.ndarray
+	blue_values: np.ndarray
+	prefix_sums: np.ndarray
+
+
 MAX_CUBES_RED = 12
 MAX_CUBES_GREEN = 13
 MAX_CUBES_BLUE = 14
+GAME_TOKEN_REGEX = re.compile(r"Game (\d+)|(\d+) (r|g|b)")
+COLOR_INDEX = {"r": 0, "g": 1, "b": 2}
 
 
 def parse_game(input_line: str) -> Game:
@@ -42,15 +80,157 @@ def parse_game(input_line: str) -> Game:
 	return Game(id=game_id_parsed, cubes_sets=cubes_parsed)
 
 
-def part_one(games: list[Game]) -> int:
-	for game in games:
-		if any([cubes_set.red > MAX_CUBES_RED or cubes_set.green > MAX_CUBES_GREEN or cubes_set.blue > MAX_CUBES_BLUE
-				for cubes_set in game.cubes_sets]):
-			game.is_valid = False
-	return sum([game.id for game in games if game.is_valid])
+def parse_games_table(input_lines: Iterable[str]) -> GamesTable:
+	"""
+	Method parsing games straight into a columnar table. Each line is scanned once with a single precompiled regex
+	matching either the game id or a cubes count with the first letter of its color. Blank lines are skipped.
+	:param input_lines: lines representing games
+	:return: games table
+	:raises ValueError: if a line does not contain exactly one game id
+	"""
+	ids = []
+	maxes = []
+	for line_number, input_line in enumerate(input_lines, start=1):
+		if len(input_line.strip()) == 0:
+			continue
+		line_ids = []
+		game_maxes = [0, 0, 0]
+		for token in GAME_TOKEN_REGEX.finditer(input_line):
+			game_id, count, color = token.groups()
+			if game_id is not None:
+				line_ids.append(int(game_id))
+			elif int(count) > game_maxes[COLOR_INDEX[color]]:
+				game_maxes[COLOR_INDEX[color]] = int(count)
+		if len(line_ids) != 1:
+			raise ValueError(f"Line {line_number} does not contain exactly one game id: {input_line.strip()!r}")
+		ids.extend(line_ids)
+		maxes.append(game_maxes)
+	maxes = np.array(maxes, dtype=np.int64).reshape(-1, 3)
+	return GamesTable(
+		ids=np.array(ids, dtype=np.int64),
+		max_red=maxes[:, 0].copy(),
+		max_green=maxes[:, 1].copy(),
+		max_blue=maxes[:, 2].copy()
+	)
+
+
+def parse_input(path: str = "./input.txt") -> GamesTable:
+	with open(path, "r") as f:
+		games_table = parse_games_table(input_lines=f)
+	return games_table
+
+
+def get_valid_games_ids_sum(games_table: GamesTable, max_red: int, max_green: int, max_blue: int) -> int:
+	"""
+	Method summing ids of games possible with given numbers of cubes of each color.
+	:param games_table: games table
+	:param max_red: number of red cubes in the bag
+	:param max_green: number of green cubes in the bag
+	:param max_blue: number of blue cubes in the bag
+	:return: sum of valid games ids
+	"""
+	is_valid = (
+		(games_table.max_red <= max_red) & (games_table.max_green <= max_green) & (games_table.max_blue <= max_blue)
+	)
+	return int(games_table.ids[is_valid].sum())
+
+
+def build_budget_index(games_table: GamesTable) -> BudgetIndex:
+	"""
+	Method building a budget index. Ids of games are added to the cells of their compressed maxima, then the grid is
+	summed cumulatively along every axis. Size of the index depends on the number of distinct maxima per color, not on
+	the number of games.
+	:param games_table: games table
+	:return: budget index
+	"""
+	red_values, red_coords = np.unique(games_table.max_red, return_inverse=True)
+	green_values, green_coords = np.unique(games_table.max_green, return_inverse=True)
+	blue_values, blue_coords = np.unique(games_table.max_blue, return_inverse=True)
+	prefix_sums = np.zeros((len(red_values) + 1, len(green_values) + 1, len(blue_values) + 1), dtype=np.int64)
+	np.add.at(prefix_sums, (red_coords + 1, green_coords + 1, blue_coords + 1), games_table.ids)
+	for axis in range(3):
+		np.cumsum(prefix_sums, axis=axis, out=prefix_sums)
+	return BudgetIndex(
+		red_values=red_values,
+		green_values=green_values,
+		blue_values=blue_values,
+		prefix_sums=prefix_sums
+	)
+
+
+def query_budget_index_batch(budget_index: BudgetIndex, budgets: np.ndarray) -> np.ndarray:
+	"""
+	Method answering many budget queries at once. Each query is reduced to three binary searches and a single lookup.
+	:param budget_index: budget index
+	:param budgets: array of shape (n, 3) with numbers of red, green and blue cubes in the bag
+	:return: array of sums of valid games ids for each budget
+	"""
+	budgets = np.asarray(budgets, dtype=np.int64).reshape(-1, 3)
+	return budget_index.prefix_sums[
+		np.searchsorted(budget_index.red_values, budgets[:, 0], side="right"),
+		np.searchsorted(budget_index.green_values, budgets[:, 1], side="right"),
+		np.searchsorted(budget_index.blue_values, budgets[:, 2], side="right")
+	]
+
+
+def query_budget_index(budget_index: BudgetIndex, max_red: int, max_green: int, max_blue: int) -> int:
+	"""
+	Method returning sum of ids of games possible with given numbers of cubes of each color.
+	:param budget_index: budget index
+	:param max_red: number of red cubes in the bag
+	:param max_green: number of green cubes in the bag
+	:param max_blue: number of blue cubes in the bag
+	:return: sum of valid games ids
+	"""
+	return int(query_budget_index_batch(budget_index=budget_index, budgets=[(max_red, max_green, max_blue)])[0])
+
+
+def benchmark_budget_queries(games_table: GamesTable, queries_count: int, seed: int = 0) -> dict[str, float]:
+	"""
+	Method comparing the budget index against rescanning the games table for every query. Random budgets are drawn
+	from the range of observed maxima, answers of both methods are checked to be equal.
+	:param games_table: games table
+	:param queries_count: number of budget queries
+	:param seed: random generator seed
+	:return: dictionary with times (in seconds) of building the index, answering the queries and rescanning
+	"""
+	generator = np.random.default_rng(seed)
+	budgets = np.stack([
+		generator.integers(0, int(column.max(initial=0)) + 2, size=queries_count)
+		for column in (games_table.max_red, games_table.max_green, games_table.max_blue)
+	], axis=1)
+	start = time.perf_counter()
+	budget_index = build_budget_index(games_table=games_table)
+	build_time = time.perf_counter() - start
+	start = time.perf_counter()
+	index_answers = query_budget_index_batch(budget_index=budget_index, budgets=budgets)
+	query_time = time.perf_counter() - start
+	start = time.perf_counter()
+	rescan_answers = [
+		get_valid_games_ids_sum(games_table=games_table, max_red=red, max_green=green, max_blue=blue)
+		for red, green, blue in budgets.tolist()
+	]
+	rescan_time = time.perf_counter() - start
+	if index_answers.tolist() != rescan_answers:
+		raise ValueError("Budget index answers differ from rescan answers")
+	return {"index_build": build_time, "index_queries": query_time, "rescan_queries": rescan_time}
+
+
+def part_one(games: list[Game] | GamesTable) -> int:
+	if isinstance(games, GamesTable):
+		return get_valid_games_ids_sum(
+			games_table=games, max_red=MAX_CUBES_RED, max_green=MAX_CUBES_GREEN, max_blue=MAX_CUBES_BLUE
+		)
+	return sum(
+		game.id for game in games
+		if all(cubes_set.red <= MAX_CUBES_RED and cubes_set.green <= MAX_CUBES_GREEN and cubes_set.blue <= MAX_CUBES_BLUE
+			   for cubes_set in game.cubes_sets)
+	)
 
 
-def part_two(games: list[Game]) -> int:
+def part_two(games: list[Game] | GamesTable) -> int:
+	if isinstance(games, GamesTable):
+		return int((games.max_red * games.max_green * games.max_blue).sum())
 	sum_of_maxes = 0
 	for game in games:
 		max_red = max([cubes_set.red for cubes_set in game.cubes_sets])
@@ -61,7 +241,13 @@ def part_two(games: list[Game]) -> int:
 
 
 if __name__ == "__main__":
-	with open("./input.txt", "r") as f:
-		games = [parse_game(input_line=line) for line in f.readlines()]
-	print(f"Part one: {part_one(games=games)}")
-	print(f"Part two: {part_two(games=games)}")
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--benchmark-queries", type=int, default=0, help="number of budget queries to benchmark")
+	args = parser.parse_args()
+	games_table = parse_input()
+	if args.benchmark_queries > 0:
+		timings = benchmark_budget_queries(games_table=games_table, queries_count=args.benchmark_queries)
+		for name, seconds in timings.items():
+			print(f"{name}: {seconds:.6f} s")
+	print(f"Part one: {part_one(games=games_table)}")
+	print(f"Part two: {part_two(games=games_table)}")
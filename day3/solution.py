@@ -1,7 +1,22 @@
+import argparse
+import re
+import numpy as np
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import reduce
 
+NEWLINE = ord("\n")
+DOT = ord(".")
+DIGIT_0 = ord("0")
+DIGIT_9 = ord("9")
+GEAR = ord("*")
+NUMBER_REGEX = re.compile(rb"\d+")
+SYMBOL = b"#"
+# translation table turning a row into its symbol mask: symbols become SYMBOL, everything else a dot
+SYMBOL_MASK_TABLE = bytes(
+	DOT if byte == DOT or DIGIT_0 <= byte <= DIGIT_9 or byte in b"\r\n" else SYMBOL[0] for byte in range(256)
+)
+
 
 @dataclass
 class Point:
@@ -23,6 +38,166 @@ class PartNumber:
 	symbols: list[Symbol]
 
 
+@dataclass
+class GearIndex:
+	"""
+	Class representing an index of part numbers adjacent to each symbol. Symbol positions are packed into integer keys
+	y * width + x, part numbers are referred to by their index in the parsed list.
+	:param width: width of the schematic used for packing positions
+	:param part_values: value of each indexed part number
+	:param symbols: dictionary mapping packed positions to symbols
+	:param parts_by_symbol: dictionary mapping packed positions of symbols to ids of adjacent part numbers
+	"""
+	width: int
+	part_values: list[int] = field(default_factory=list)
+	symbols: dict[int, str] = field(default_factory=dict)
+	parts_by_symbol: dict[int, list[int]] = field(default_factory=lambda: defaultdict(list))
+
+	def add_part_number(self, part_number: PartNumber) -> int:
+		"""
+		Method adding a part number to the index. Positions of parsed part numbers include the border drawn around the
+		schematic, so they are shifted back before packing.
+		:param part_number: parsed part number
+		:return: id assigned to the part number
+		"""
+		part_id = len(self.part_values)
+		self.part_values.append(part_number.value)
+		for symbol in part_number.symbols:
+			key = (symbol.position.y - 1) * self.width + symbol.position.x - 1
+			self.symbols[key] = symbol.value
+			self.parts_by_symbol[key].append(part_id)
+		return part_id
+
+	def get_adjacent_parts(self, x: int, y: int) -> list[int]:
+		"""
+		Method returning ids of part numbers adjacent to the symbol at given position of the schematic.
+		:param x: column of the symbol
+		:param y: row of the symbol
+		:return: list of part number ids
+		"""
+		return self.parts_by_symbol.get(y * self.width + x, [])
+
+	def get_gear_ratios_sum(self) -> int:
+		"""
+		Method summing products of part numbers adjacent to every asterisk with more than one adjacent part number.
+		:return: sum of gear ratios
+		"""
+		gears_sum = 0
+		for key, part_ids in self.parts_by_symbol.items():
+			if self.symbols[key] == "*" and len(part_ids) > 1:
+				gears_sum += reduce((lambda x, y: x * y), [self.part_values[part_id] for part_id in part_ids])
+		return gears_sum
+
+
+@dataclass
+class NumberRuns:
+	"""
+	Class representing numbers found in a schematic loaded as an array. Cells of a schematic are addressed with flat
+	indexes of the array, which includes the newline column.
+	:param labels: array of the schematic shape with 1-based number id for digit cells and 0 elsewhere
+	:param starts: flat index of the first digit of each number
+	:param values: value of each number
+	:param is_part_number: whether each number is adjacent to a symbol
+	"""
+	labels: np.ndarray
+	starts: np.ndarray
+	values: np.ndarray
+	is_part_number: np.ndarray
+
+
+@dataclass
+class SchematicScanner:
+	"""
+	Class scanning a schematic row by row with a window of three rows. Numbers of a row are resolved once the row below
+	it is pushed, and gears of a row are resolved once numbers of the row below are, so both answers are updated as the
+	window moves and memory depends only on the row width. Part numbers are emitted in the coordinates used by
+	parse_input, i.e. shifted by the border.
+	:param part_numbers_sum: sum of part numbers of resolved rows (part one)
+	:param gear_ratios_sum: sum of gear ratios of resolved rows (part two)
+	:param rows_count: number of pushed rows
+	:param previous_row: row above the current one
+	:param current_row: row whose numbers are resolved when the next row is pushed
+	:param pending_gears: values of part numbers adjacent to every asterisk by row and column, for unresolved rows
+	"""
+	part_numbers_sum: int = 0
+	gear_ratios_sum: int = 0
+	rows_count: int = 0
+	previous_row: bytes = b""
+	current_row: bytes | None = None
+	pending_gears: dict[int, dict[int, list[int]]] = field(
+		default_factory=lambda: defaultdict(lambda: defaultdict(list))
+	)
+
+	def _resolve_current_row(self, next_row: bytes) -> list[PartNumber]:
+		y = self.rows_count - 1
+		window = [
+			(y + dy, row, row.translate(SYMBOL_MASK_TABLE))
+			for dy, row in ((-1, self.previous_row), (0, self.current_row), (1, next_row))
+		]
+		part_numbers = []
+		for match in NUMBER_REGEX.finditer(self.current_row):
+			left, right = max(match.start() - 1, 0), match.end() + 1
+			value = int(match.group())
+			symbols = []
+			for row_y, row, symbol_mask in window:
+				column = symbol_mask.find(SYMBOL, left, right)
+				while column != -1:
+					symbols.append(Symbol(position=Point(x=column + 1, y=row_y + 1), value=chr(row[column])))
+					if row[column] == GEAR:
+						self.pending_gears[row_y][column].append(value)
+					column = symbol_mask.find(SYMBOL, column + 1, right)
+			if len(symbols) > 0:
+				self.part_numbers_sum += value
+			part_numbers.append(PartNumber(
+				position=Point(x=match.start() + 1, y=y + 1), length=match.end() - match.start(), value=value,
+				symbols=symbols
+			))
+		self._resolve_gears(max_row=y - 1)
+		return part_numbers
+
+	def _resolve_gears(self, max_row: int):
+		for gear_row in [row for row in self.pending_gears if row <= max_row]:
+			for part_values in self.pending_gears.pop(gear_row).values():
+				if len(part_values) > 1:
+					self.gear_ratios_sum += reduce((lambda x, y: x * y), part_values)
+
+	def push_row(self, row: bytes) -> list[PartNumber]:
+		"""
+		Method moving the window one row down.
+		:param row: next row of the schematic, line endings are ignored
+		:return: part numbers of the row above the pushed one, which have just been resolved
+		"""
+		row = row.rstrip(b"\r\n")
+		part_numbers = [] if self.current_row is None else self._resolve_current_row(next_row=row)
+		self.previous_row, self.current_row = self.current_row or b"", row
+		self.rows_count += 1
+		return part_numbers
+
+	def finish(self) -> list[PartNumber]:
+		"""
+		Method resolving the last pushed row and all remaining gears.
+		:return: part numbers of the last row
+		"""
+		part_numbers = [] if self.current_row is None else self._resolve_current_row(next_row=b"")
+		self.previous_row, self.current_row = b"", None
+		self._resolve_gears(max_row=self.rows_count)
+		return part_numbers
+
+
+def scan_schematic(path: str = "./input.txt") -> SchematicScanner:
+	"""
+	Method computing both answers while reading the schematic line by line.
+	:param path: path to the input file
+	:return: scanner with both answers
+	"""
+	scanner = SchematicScanner()
+	with open(path, "rb") as f:
+		for line in f:
+			scanner.push_row(row=line)
+	scanner.finish()
+	return scanner
+
+
 def draw_border(engine_schematic: list[str]) -> list[str]:
 	"""
 	Helper method for easier processing of input data. Border of dots of thickness = 1 is drawn to allow processing all
@@ -36,15 +211,26 @@ def draw_border(engine_schematic: list[str]) -> list[str]:
 	return engine_schematic
 
 
-def parse_input() -> list[PartNumber]:
+def parse_input(path: str = "./input.txt") -> list[PartNumber]:
 	"""
 	Helper method to parse input board into list of part numbers with information on adjacent symbols and their position.
 	For each part number, the search for an adjacent symbol is performed (iteration over fields around digits)
+	:param path: path to the input file
 	:return: list of part numbers with information of position of the number, its value, details of adjacent symbols
 	"""
-	with open("./input.txt", "r") as f:
+	return parse_input_with_gear_index(path=path)[0]
+
+
+def parse_input_with_gear_index(path: str = "./input.txt") -> tuple[list[PartNumber], GearIndex]:
+	"""
+	Same as parse_input, but additionally indexes every part number by positions of its adjacent symbols while parsing.
+	:param path: path to the input file
+	:return: list of part numbers and the gear index
+	"""
+	with open(path, "r") as f:
 		engine_schematic = f.read().split("\n")
 	engine_schematic = draw_border(engine_schematic)
+	gear_index = GearIndex(width=len(engine_schematic[0]) - 2)
 	part_numbers = []
 	for y in range(1, len(engine_schematic) - 1):
 		x = 0
@@ -72,28 +258,117 @@ def parse_input() -> list[PartNumber]:
 					value=int(number),
 					symbols=special_symbols
 				))
+				gear_index.add_part_number(part_number=part_numbers[-1])
 				x = num_end + 1
-	return part_numbers
+	return part_numbers, gear_index
+
+
+def load_schematic(path: str = "./input.txt") -> np.ndarray:
+	"""
+	Method loading engine schematic as a 2D array of bytes. The file is viewed directly as rows of width + 1 bytes, so
+	the newline character stays as the last column and separates numbers of consecutive rows.
+	:param path: path to the input file
+	:return: 2D uint8 array with rows of the schematic
+	"""
+	raw = np.fromfile(path, dtype=np.uint8)
+	content_end = len(raw)
+	while content_end > 0 and raw[content_end - 1] == NEWLINE:
+		content_end -= 1
+	raw = np.append(raw[:content_end], NEWLINE) if content_end == len(raw) else raw[:content_end + 1]
+	width = int(np.argmax(raw == NEWLINE)) + 1
+	return raw.reshape(-1, width)
+
+
+def get_symbol_mask(schematic: np.ndarray) -> np.ndarray:
+	"""
+	Helper method marking cells holding symbols, i.e. anything except digits, dots and line endings.
+	:param schematic: 2D array with the schematic
+	:return: boolean array of the schematic shape
+	"""
+	is_digit = (schematic >= DIGIT_0) & (schematic <= DIGIT_9)
+	return ~is_digit & (schematic != DOT) & ~np.isin(schematic, [NEWLINE, ord("\r")])
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+	"""
+	Helper method extending a boolean mask onto all 8 neighbours of every marked cell (3x3 neighbourhood).
+	:param mask: 2D boolean array
+	:return: dilated boolean array of the same shape
+	"""
+	padded = np.pad(mask, 1)
+	rows, cols = mask.shape
+	dilated = np.zeros_like(mask)
+	for dy in range(3):
+		for dx in range(3):
+			dilated |= padded[dy:dy + rows, dx:dx + cols]
+	return dilated
+
+
+def label_numbers(schematic: np.ndarray) -> NumberRuns:
+	"""
+	Method finding all numbers in the schematic as runs of digit cells. Values are assembled digit by digit for all
+	numbers at once, a number is a part number if any of its digits touches the dilated symbol mask.
+	:param schematic: 2D array with the schematic
+	:return: numbers found in the schematic
+	"""
+	flat = schematic.ravel()
+	is_digit = (flat >= DIGIT_0) & (flat <= DIGIT_9)
+	is_start = is_digit.copy()
+	is_start[1:] &= ~is_digit[:-1]
+	is_end = is_digit.copy()
+	is_end[:-1] &= ~is_digit[1:]
+	starts = np.flatnonzero(is_start)
+	lengths = np.flatnonzero(is_end) + 1 - starts
+	labels = np.cumsum(is_start) * is_digit
+	values = np.zeros(len(starts), dtype=np.int64)
+	for digit_idx in range(int(lengths.max(initial=0))):
+		in_number = digit_idx < lengths
+		values[in_number] = values[in_number] * 10 + (flat[starts[in_number] + digit_idx] - DIGIT_0)
+	is_adjacent = dilate(get_symbol_mask(schematic)).ravel()
+	adjacent_digits_count = np.bincount(labels[is_digit] - 1, weights=is_adjacent[is_digit], minlength=len(starts))
+	return NumberRuns(
+		labels=labels.reshape(schematic.shape),
+		starts=starts,
+		values=values,
+		is_part_number=adjacent_digits_count > 0
+	)
+
+
+def sum_part_numbers(schematic: np.ndarray) -> int:
+	"""
+	Vectorized equivalent of part_one working directly on the schematic array.
+	:param schematic: 2D array with the schematic
+	:return: sum of part numbers
+	"""
+	number_runs = label_numbers(schematic=schematic)
+	return int(number_runs.values[number_runs.is_part_number].sum())
 
 
 def part_one(part_numbers: list[PartNumber]) -> int:
 	return sum([part_number.value for part_number in part_numbers if len(part_number.symbols) > 0])
 
 
-def part_two(part_numbers: list[PartNumber]) -> int:
-	asterix_adjacent_numbers = [(part_number.position, part_number.value, symbol.position)
-								for part_number in part_numbers
-								for symbol in part_number.symbols
-								if symbol.value == "*"]
-	numbers_for_asterix = defaultdict(set)
-	for part_number_position, part_number_value, symbol_position in asterix_adjacent_numbers:
-		numbers_for_asterix[f"{symbol_position.x}_{symbol_position.y}"].add(f"{part_number_position.x}_{part_number_position.y}_{part_number_value}")
-	gears_candidates = [numbers for _, numbers in numbers_for_asterix.items() if len(numbers) > 1]
-	gears_sum = sum(reduce((lambda x, y: x * y), [int(number.split("_")[2]) for number in numbers]) for numbers in gears_candidates)
-	return gears_sum
+def part_two(part_numbers: list[PartNumber], gear_index: GearIndex | None = None) -> int:
+	if gear_index is None:
+		gear_index = GearIndex(width=max(
+			(symbol.position.x for part_number in part_numbers for symbol in part_number.symbols), default=0
+		))
+		for part_number in part_numbers:
+			gear_index.add_part_number(part_number=part_number)
+	return gear_index.get_gear_ratios_sum()
 
 
 if __name__ == "__main__":
-	input_part_numbers = parse_input()
-	print(f"Part one: {part_one(part_numbers=input_part_numbers)}")
-	print(f"Part two: {part_two(part_numbers=input_part_numbers)}")
+	parser = argparse.ArgumentParser()
+	parser.add_argument(
+		"--stream", action="store_true", help="scan the schematic row by row, keeping only three rows in memory"
+	)
+	args = parser.parse_args()
+	if args.stream:
+		input_scanner = scan_schematic()
+		print(f"Part one: {input_scanner.part_numbers_sum}")
+		print(f"Part two: {input_scanner.gear_ratios_sum}")
+	else:
+		input_part_numbers, input_gear_index = parse_input_with_gear_index()
+		print(f"Part one: {part_one(part_numbers=input_part_numbers)}")
+		print(f"Part two: {part_two(part_numbers=input_part_numbers, gear_index=input_gear_index)}")
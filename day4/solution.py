@@ -1,6 +1,25 @@
+import argparse
+import copy
+import hashlib
+import json
+import os
 import re
+import sys
 import numpy as np
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import BinaryIO, Iterable
+
+if __name__ == "__main__":  # run as a script from the day directory, the repository root is not on the path then
+	sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.tokenizer import tokenize_integers  # noqa: E402
+
+# bytes at the start of the input and before the ledger offset whose hash is checked when resuming
+FINGERPRINT_BLOCK_SIZE = 4096
+# rows of the boolean matrix unpacked at once when numbers are packed into bitsets
+BITSET_BLOCK_ROWS = 1 << 16
+# number of set bits of every byte, used to count bits when np.bitwise_count (numpy >= 2.0) is not available
+POPCOUNT_TABLE = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
 
 
 @dataclass
@@ -38,23 +57,254 @@ def parse_card(card: str) -> Card:
 	)
 
 
-def part_one(cards: list[Card]) -> int:
-	cards_winning_count = [len(set(card.guessed_numbers).intersection(set(card.winning_numbers))) for card in cards]
+def get_numbers_bitset(numbers_lists: list[list[int]], width: int) -> np.ndarray:
+	"""
+	Helper method encoding lists of numbers as rows of a bitset, where bit n % 8 (most significant first) of byte
+	[i, n // 8] is set if number n is in i-th list. Rows are set in a boolean matrix of BITSET_BLOCK_ROWS rows and
+	packed block by block, so a byte per number is allocated only for a single block.
+	:param numbers_lists: list of lists of numbers
+	:param width: number of possible numbers, greater than any number
+	:return: uint8 matrix with one row per list
+	"""
+	numbers_bitset = np.zeros((len(numbers_lists), (width + 7) // 8), dtype=np.uint8)
+	rows = np.repeat(np.arange(len(numbers_lists)), [len(numbers) for numbers in numbers_lists])
+	numbers = np.fromiter((number for numbers in numbers_lists for number in numbers), dtype=np.int64, count=len(rows))
+	block_starts = range(0, len(numbers_lists), BITSET_BLOCK_ROWS)
+	boundaries = np.searchsorted(rows, [*block_starts, len(numbers_lists)]).tolist()
+	for block_idx, block_start in enumerate(block_starts):
+		block_end = min(block_start + BITSET_BLOCK_ROWS, len(numbers_lists))
+		start, end = boundaries[block_idx], boundaries[block_idx + 1]
+		numbers_block = np.zeros((block_end - block_start, width), dtype=bool)
+		numbers_block[rows[start:end] - block_start, numbers[start:end]] = True
+		numbers_bitset[block_start:block_end] = np.packbits(numbers_block, axis=1)
+	return numbers_bitset
+
+
+def count_set_bits(bitset: np.ndarray) -> np.ndarray:
+	"""
+	Helper method counting set bits in every row of a bitset.
+	:param bitset: uint8 matrix
+	:return: array with number of set bits for each row
+	"""
+	if hasattr(np, "bitwise_count"):
+		return np.bitwise_count(bitset).sum(axis=1, dtype=np.int64)
+	return POPCOUNT_TABLE[bitset].sum(axis=1, dtype=np.int64)
+
+
+def get_cards_winning_count(cards: list[Card]) -> np.ndarray:
+	"""
+	Method counting guessed winning numbers of all cards at once. Numbers of every card are encoded as rows of
+	bitsets, so the counts come from a single AND of the bitsets followed by a row-wise popcount.
+	:param cards: list of cards
+	:return: array with number of guessed winning numbers for each card
+	"""
+	width = max((number for card in cards for number in card.winning_numbers + card.guessed_numbers), default=0) + 1
+	winning_bitset = get_numbers_bitset(numbers_lists=[card.winning_numbers for card in cards], width=width)
+	guessed_bitset = get_numbers_bitset(numbers_lists=[card.guessed_numbers for card in cards], width=width)
+	return count_set_bits(bitset=winning_bitset & guessed_bitset)
+
+
+def part_one(cards: list[Card], cards_winning_count: np.ndarray | None = None) -> int:
+	if cards_winning_count is None:
+		cards_winning_count = get_cards_winning_count(cards=cards)
 	return sum(
-		[pow(2, card_winning - 1) for card_winning in cards_winning_count if card_winning > 0]
+		[pow(2, card_winning - 1) for card_winning in cards_winning_count.tolist() if card_winning > 0]
 	)
 
 
-def part_two(cards: list[Card]) -> int:
-	cards_copies = np.array([1] * (len(cards)))
-	cards_winning_count = [len(set(card.guessed_numbers).intersection(set(card.winning_numbers))) for card in cards]
-	for idx, card_winning_count in enumerate(cards_winning_count):
-		cards_copies[idx+1:idx+1+card_winning_count] += cards_copies[idx]
-	return sum(cards_copies)
+def part_two(cards: list[Card], cards_winning_count: np.ndarray | None = None) -> int:
+	"""
+	Copies of a card are added to a contiguous range of following cards, so they are recorded in a difference array:
+	added at the start of the range and subtracted right after its end. Running sum of the difference array gives the
+	number of copies won for each card, in O(n) total.
+	:param cards: list of cards
+	:param cards_winning_count: precomputed result of get_cards_winning_count
+	:return: total number of cards
+	"""
+	if cards_winning_count is None:
+		cards_winning_count = get_cards_winning_count(cards=cards)
+	copies_difference = [0] * (len(cards) + 1)
+	won_copies = 0
+	total_cards = 0
+	for idx, card_winning_count in enumerate(cards_winning_count.tolist()):
+		won_copies += copies_difference[idx]
+		card_copies = 1 + won_copies
+		total_cards += card_copies
+		copies_difference[min(idx + 1, len(cards))] += card_copies
+		copies_difference[min(idx + 1 + card_winning_count, len(cards))] -= card_copies
+	return total_cards
 
 
-if __name__ == "__main__":
-	with open("./input.txt", "r") as f:
+@dataclass
+class ScratchcardLedger:
+	"""
+	Class keeping both answers up to date while cards are appended. Copies only flow forward, so the copies won by
+	earlier cards are kept as a difference window over the next few cards, never longer than the highest winning count
+	plus one. Appending a card is O(1) apart from parsing, and the whole state can be saved and resumed later.
+	:param cards_count: number of appended cards
+	:param score: points of appended cards (part one)
+	:param total_cards: number of appended cards including won copies (part two)
+	:param won_copies: copies won for the last appended card
+	:param copies_difference: difference of won copies for the following cards, the first element applies to the next
+	card
+	:param offset: number of bytes of the input file already read by append_from_file
+	:param consumed_fingerprint: hash of the first and the last bytes read by append_from_file, to detect a replaced
+	input file
+	"""
+	cards_count: int = 0
+	score: int = 0
+	total_cards: int = 0
+	won_copies: int = 0
+	copies_difference: deque[int] = field(default_factory=deque)
+	offset: int = 0
+	consumed_fingerprint: str = hashlib.sha256(b"").hexdigest()
+
+	def append_winning_count(self, winning_count: int):
+		"""
+		Method appending a card given by its number of guessed winning numbers.
+		:param winning_count: number of guessed winning numbers of the card
+		"""
+		if len(self.copies_difference) > 0:
+			self.won_copies += self.copies_difference.popleft()
+		card_copies = 1 + self.won_copies
+		self.cards_count += 1
+		self.total_cards += card_copies
+		if winning_count == 0:
+			return
+		self.score += 1 << (winning_count - 1)
+		while len(self.copies_difference) <= winning_count:
+			self.copies_difference.append(0)
+		self.copies_difference[0] += card_copies
+		self.copies_difference[winning_count] -= card_copies
+
+	def append_card(self, card: Card):
+		self.append_winning_count(winning_count=len(set(card.winning_numbers) & set(card.guessed_numbers)))
+
+	def append_lines(self, lines: Iterable[str]):
+		"""
+		Method parsing and appending cards, blank lines are skipped.
+		:param lines: input lines, one card per line
+		"""
+		for line in lines:
+			if len(line.strip()) > 0:
+				self.append_card(card=parse_card(card=line))
+
+	def append_from_file(self, path: str) -> bytes:
+		"""
+		Method appending cards added to the input file since the previous call, reading only the new part of the file.
+		Only lines ending with a newline are consumed, an unterminated last line may still be being written, so it is
+		left for the next call. Before reading, the file is checked not to be shorter than the consumed part and to hold
+		the same bytes at the start and right before the offset, which catches truncated and replaced inputs.
+		:param path: path to the input file
+		:return: unterminated last line, empty if the file ends with a newline
+		"""
+		with open(path, "rb") as f:
+			if os.fstat(f.fileno()).st_size < self.offset:
+				raise ValueError(f"{path} is shorter than the {self.offset} bytes already consumed, it was truncated")
+			if self._get_consumed_fingerprint(f=f) != self.consumed_fingerprint:
+				raise ValueError(f"{path} does not start with the already consumed cards, it was replaced")
+			f.seek(self.offset)
+			unterminated_line = b""
+			for line in f:
+				if not line.endswith(b"\n"):
+					unterminated_line = line
+					break
+				self.append_lines(lines=[line.decode()])
+				self.offset += len(line)
+			self.consumed_fingerprint = self._get_consumed_fingerprint(f=f)
+		return unterminated_line
+
+	def _get_consumed_fingerprint(self, f: BinaryIO) -> str:
+		"""
+		Helper method hashing the first and the last FINGERPRINT_BLOCK_SIZE bytes of the consumed part of a file, so
+		that checking it costs the same regardless of the consumed size.
+		:param f: input file opened in binary mode
+		:return: hexadecimal digest
+		"""
+		fingerprint = hashlib.sha256()
+		f.seek(0)
+		fingerprint.update(f.read(min(self.offset, FINGERPRINT_BLOCK_SIZE)))
+		tail_start = max(self.offset - FINGERPRINT_BLOCK_SIZE, 0)
+		f.seek(tail_start)
+		fingerprint.update(f.read(self.offset - tail_start))
+		return fingerprint.hexdigest()
+
+	def save(self, path: str):
+		"""
+		Method storing the ledger state as JSON, replacing the previous state atomically.
+		:param path: path to the state file
+		"""
+		state = asdict(self)
+		state["copies_difference"] = list(self.copies_difference)
+		with open(path + ".tmp", "w") as f:
+			json.dump(state, f)
+		os.replace(path + ".tmp", path)
+
+	@classmethod
+	def load(cls, path: str) -> "ScratchcardLedger":
+		"""
+		Method restoring a ledger saved with save, a new ledger is returned if the state file does not exist.
+		:param path: path to the state file
+		:return: ScratchcardLedger object
+		"""
+		if not os.path.exists(path):
+			return cls()
+		with open(path, "r") as f:
+			state = json.load(f)
+		state["copies_difference"] = deque(state["copies_difference"])
+		return cls(**state)
+
+
+def parse_input(path: str = "./input.txt") -> list[Card]:
+	"""
+	Method parsing all cards with the shared integer tokenizer. Colons and bars end rows as well as newlines, so every
+	card gives three rows: its id, winning numbers and guessed numbers.
+	:param path: path to the input file
+	:return: list of Card objects
+	:raises ValueError: if a line is blank or does not consist of an id, a colon, winning numbers, a bar and guessed
+	numbers, since every later card would be shifted otherwise
+	"""
+	with open(path, "rb") as f:
+		data = f.read().rstrip()
+	numbers = tokenize_integers(data=data, separators=b"\n:|")
+	lines_count = data.count(b"\n") + 1 if len(data) > 0 else 0
+	id_counts = np.diff(numbers.offsets)[0::3]
+	if len(numbers) != 3 * lines_count or np.any(id_counts != 1):
+		raise ValueError("Every line of the input has to be a card in the format \"Card <id>: <numbers> | <numbers>\"")
+	values = numbers.values.tolist()
+	offsets = numbers.offsets.tolist()
+	return [
+		Card(
+			id=values[offsets[idx]],
+			winning_numbers=values[offsets[idx + 1]:offsets[idx + 2]],
+			guessed_numbers=values[offsets[idx + 2]:offsets[idx + 3]]
+		) for idx in range(0, len(numbers), 3)
+	]
+
+
+def parse_input_reference(path: str = "./input.txt") -> list[Card]:
+	with open(path, "r") as f:
 		cards = [parse_card(card=line) for line in f.readlines()]
-	print(f"Part one: {part_one(cards=cards)}")
-	print(f"Part two: {part_two(cards=cards)}")
+	return cards
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser()
+	parser.add_argument(
+		"--ledger", default=None, help="path to a ledger state file, only cards appended since the last run are read"
+	)
+	args = parser.parse_args()
+	if args.ledger is not None:
+		ledger = ScratchcardLedger.load(path=args.ledger)
+		last_line = ledger.append_from_file(path="./input.txt")
+		ledger.save(path=args.ledger)
+		# a complete input may lack the final newline, its last card is counted in the answers but not saved
+		answers_ledger = copy.deepcopy(ledger)
+		answers_ledger.append_lines(lines=[last_line.decode()])
+		print(f"Part one: {answers_ledger.score}")
+		print(f"Part two: {answers_ledger.total_cards}")
+	else:
+		cards = parse_input()
+		input_cards_winning_count = get_cards_winning_count(cards=cards)
+		print(f"Part one: {part_one(cards=cards, cards_winning_count=input_cards_winning_count)}")
+		print(f"Part two: {part_two(cards=cards, cards_winning_count=input_cards_winning_count)}")
@@ -1,5 +1,13 @@
+import os
 import re
-from dataclasses import dataclass
+import sys
+import numpy as np
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+
+if __name__ == "__main__":  # run as a script from the day directory, the repository root is not on the path then
+	sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.tokenizer import tokenize_integers  # noqa: E402
 
 SEED_REGEX = r"(?s)(?<=seeds: )(.*?)(?=\n\n)"
 CONVERSION_REGEX = {
@@ -30,8 +38,37 @@ class Interval:
 
 @dataclass
 class Conversion:
+	"""
+	Class representing a single almanac conversion stage. Intervals are expected to be sorted by source; an index of
+	interval starts, ends and offsets is built once on creation to allow binary-search lookups.
+	:param rule: conversion rule
+	:param intervals: list of intervals sorted by source
+	"""
 	rule: ConversionRule
 	intervals: list[Interval]
+	sources: np.ndarray = field(init=False, repr=False, compare=False)
+	ends: np.ndarray = field(init=False, repr=False, compare=False)
+	offsets: np.ndarray = field(init=False, repr=False, compare=False)
+
+	def __post_init__(self):
+		self.sources = np.array([interval.source for interval in self.intervals], dtype=np.int64)
+		self.ends = np.array([interval.source + interval.step for interval in self.intervals], dtype=np.int64)
+		self.offsets = np.array([interval.target - interval.source for interval in self.intervals], dtype=np.int64)
+
+	def convert_many(self, values: np.ndarray) -> np.ndarray:
+		"""
+		Method converting an array of values at once. For each value the last interval starting at or before it is
+		found with a binary search, then the interval offset is applied if the value lies inside that interval.
+		:param values: array of input values
+		:return: array of converted values
+		"""
+		values = np.asarray(values, dtype=np.int64)
+		if len(self.sources) == 0:
+			return values.copy()
+		idx = np.searchsorted(self.sources, values, side="right") - 1
+		idx_clipped = np.maximum(idx, 0)
+		is_inside = (idx >= 0) & (values < self.ends[idx_clipped])
+		return values + np.where(is_inside, self.offsets[idx_clipped], 0)
 
 
 @dataclass
@@ -39,21 +76,62 @@ class Almanac:
 	seeds: list[int]
 	conversions: list[Conversion]
 
+	def convert_many(self, values: np.ndarray) -> np.ndarray:
+		"""
+		Method mapping an array of values through all conversions, one vectorized lookup per conversion.
+		:param values: array of seeds
+		:return: array of corresponding locations
+		"""
+		values = np.asarray(values, dtype=np.int64)
+		for conversion in self.conversions:
+			values = conversion.convert_many(values)
+		return values
+
+
+@dataclass
+class ComposedAlmanac:
+	"""
+	Single piecewise-offset map equivalent to applying all almanac conversions one after another.
+	:param starts: sorted seed values at which consecutive pieces begin
+	:param ends: seed values (exclusive) at which consecutive pieces end
+	:param offsets: value added to a seed from the corresponding piece to obtain its location
+	:param first_locations_minima: sparse table, first_locations_minima[k][i] is the lowest location of the first
+		seeds of pieces i, ..., i + 2^k - 1
+	"""
+	starts: list[int]
+	ends: list[int]
+	offsets: list[int]
+	first_locations_minima: list[np.ndarray] = field(default_factory=list, repr=False)
+
 
 def parse_intervals(lines: str, rule: re.Pattern) -> list[Interval]:
+	numbers = tokenize_integers(data=re.findall(rule, lines)[0].encode()).values.reshape(-1, 3).tolist()
+	intervals = [Interval(source=source, target=target, step=step) for target, source, step in numbers]
+	return sorted(intervals, key=lambda interval: interval.source)
+
+
+def parse_intervals_reference(lines: str, rule: re.Pattern) -> list[Interval]:
 	lines = re.findall(rule, lines)[0].split("\n")
 	lines = [line.split(" ") for line in lines]
-	return [
+	intervals = [
 		Interval(
 			source=int(line[1]),
 			target=int(line[0]),
 			step=int(line[2])
 		) for line in lines
 	]
+	return sorted(intervals, key=lambda interval: interval.source)
 
 
-def parse_almanac() -> Almanac:
-	with open("input.txt") as f:
+def parse_almanac(path: str = "input.txt", reference: bool = False) -> Almanac:
+	"""
+	Method parsing the almanac. Numbers are parsed with the shared integer tokenizer, unless the original string
+	splitting parsers are requested.
+	:param path: path to the input file
+	:param reference: whether the original parsers are used
+	:return: Almanac object
+	"""
+	with open(path) as f:
 		lines = f.read()
 	conversion_rules = [
 		ConversionRule(
@@ -63,35 +141,146 @@ def parse_almanac() -> Almanac:
 		)
 		for convert_from, convert_to in zip(PARAMETERS[:-1], PARAMETERS[1:])
 	]
+	get_intervals = parse_intervals_reference if reference else parse_intervals
 	conversions = [
 		Conversion(
 			rule=rule,
-			intervals=parse_intervals(lines=lines, rule=rule.conversion_regex)
+			intervals=get_intervals(lines=lines, rule=rule.conversion_regex)
 		) for rule in conversion_rules
 	]
-	seeds = list(map(int, re.findall(SEED_REGEX, lines)[0].split(" ")))
+	seeds_str = re.findall(SEED_REGEX, lines)[0]
+	if reference:
+		seeds = list(map(int, seeds_str.split(" ")))
+	else:
+		seeds = tokenize_integers(data=seeds_str.encode()).values.tolist()
 	return Almanac(
 		seeds=seeds,
 		conversions=conversions
 	)
 
 
+def split_range(start: int, end: int, conversion: Conversion) -> list[tuple[int, int, int]]:
+	"""
+	Helper method splitting range [start, end) at the interval boundaries of given conversion. Values not covered by
+	any interval are converted to themselves, hence they get an offset of 0.
+	:param start: first value of the range
+	:param end: first value after the range
+	:param conversion: conversion with intervals sorted by source
+	:return: list of (start, end, offset) pieces covering the whole input range, sorted by start
+	"""
+	pieces = []
+	intervals = conversion.intervals
+	idx = max(bisect_right(intervals, start, key=lambda interval: interval.source) - 1, 0)
+	current = start
+	while current < end and idx < len(intervals):
+		interval = intervals[idx]
+		interval_end = interval.source + interval.step
+		if interval_end <= current:
+			idx += 1
+			continue
+		if current < interval.source:
+			gap_end = min(interval.source, end)
+			pieces.append((current, gap_end, 0))
+			current = gap_end
+			continue
+		piece_end = min(interval_end, end)
+		pieces.append((current, piece_end, interval.target - interval.source))
+		current = piece_end
+		idx += 1
+	if current < end:
+		pieces.append((current, end, 0))
+	return pieces
+
+
+def propagate_ranges(ranges: list[tuple[int, int]], conversions: list[Conversion]) -> list[tuple[int, int]]:
+	"""
+	Method pushing whole ranges of values through all conversions, splitting them wherever an interval boundary is hit.
+	The amount of work depends only on the number of ranges and intervals, not on the length of the ranges.
+	:param ranges: list of [start, end) ranges of input values
+	:param conversions: conversions to be applied in order
+	:return: list of [start, end) ranges of output values
+	"""
+	for conversion in conversions:
+		ranges = [
+			(piece_start + offset, piece_end + offset)
+			for start, end in ranges
+			for piece_start, piece_end, offset in split_range(start=start, end=end, conversion=conversion)
+		]
+	return ranges
+
+
+def compose_almanac(almanac: Almanac) -> ComposedAlmanac:
+	"""
+	Method merging all almanac conversions into one sorted piecewise-offset map. Every value greater or equal to the
+	last interval end of any conversion is left unchanged by each of them, so the map only needs to cover the range
+	below that bound; anything above it has an offset of 0.
+	:param almanac: parsed almanac
+	:return: composed almanac
+	"""
+	upper_bound = max(
+		interval.source + interval.step
+		for conversion in almanac.conversions
+		for interval in conversion.intervals
+	)
+	pieces = [(0, upper_bound, 0)]
+	for conversion in almanac.conversions:
+		pieces = [
+			(piece_start - offset, piece_end - offset, offset + piece_offset)
+			for start, end, offset in pieces
+			for piece_start, piece_end, piece_offset in split_range(
+				start=start + offset, end=end + offset, conversion=conversion
+			)
+		]
+	first_locations_minima = [np.array([start + offset for start, _, offset in pieces], dtype=np.int64)]
+	while 1 << len(first_locations_minima) <= len(pieces):
+		half_length = 1 << (len(first_locations_minima) - 1)
+		previous_minima = first_locations_minima[-1]
+		first_locations_minima.append(np.minimum(previous_minima[:-half_length], previous_minima[half_length:]))
+	return ComposedAlmanac(
+		starts=[start for start, _, _ in pieces],
+		ends=[end for _, end, _ in pieces],
+		offsets=[offset for _, _, offset in pieces],
+		first_locations_minima=first_locations_minima
+	)
+
+
+def get_location(composed_almanac: ComposedAlmanac, seed: int) -> int:
+	"""
+	Helper method converting a single seed into its location with a binary search over the composed almanac.
+	:param composed_almanac: composed almanac
+	:param seed: seed value
+	:return: location value
+	"""
+	idx = bisect_right(composed_almanac.starts, seed) - 1
+	if idx < 0 or seed >= composed_almanac.ends[idx]:
+		return seed
+	return seed + composed_almanac.offsets[idx]
+
+
+def get_min_location(composed_almanac: ComposedAlmanac, start: int, end: int) -> int:
+	"""
+	Helper method returning the lowest location for seeds in range [start, end). Within a single piece locations grow
+	together with seeds, so only the first seed of each overlapping piece has to be checked. Minimum over pieces
+	starting inside the range is taken from the sparse table with two lookups.
+	:param composed_almanac: composed almanac
+	:param start: first seed of the range
+	:param end: first seed after the range
+	:return: lowest location
+	"""
+	min_location = get_location(composed_almanac=composed_almanac, seed=start)
+	first_idx = bisect_right(composed_almanac.starts, start)
+	last_idx = bisect_left(composed_almanac.starts, end)
+	if first_idx < last_idx:
+		level = (last_idx - first_idx).bit_length() - 1
+		minima = composed_almanac.first_locations_minima[level]
+		min_location = min(min_location, int(minima[first_idx]), int(minima[last_idx - (1 << level)]))
+	if composed_almanac.ends[-1] < end:
+		min_location = min(min_location, max(start, composed_almanac.ends[-1]))
+	return min_location
+
+
 def part_one(almanac: Almanac) -> int:
-	seeds_locations = []
-	for seed in almanac.seeds:
-		current_value = seed
-		conversion_rules_to_intervals = {
-			f"{interval.rule.convert_from}_{interval.rule.convert_to}": interval
-			for interval in almanac.conversions
-		}
-		for parameter, next_parameter in zip(PARAMETERS[:-1], PARAMETERS[1:]):
-			current_conversion = conversion_rules_to_intervals[f"{parameter}_{next_parameter}"]
-			for interval in current_conversion.intervals:
-				if interval.source <= current_value < interval.source + interval.step:
-					current_value += interval.target - interval.source
-					break
-		seeds_locations.append(current_value)
-	return min(seeds_locations)
+	return int(almanac.convert_many(np.array(almanac.seeds, dtype=np.int64)).min())
 
 
 def part_two(almanac: Almanac) -> int:
@@ -99,8 +288,11 @@ def part_two(almanac: Almanac) -> int:
 		(seed, seed+seed_range)
 		for seed, seed_range in zip(almanac.seeds[::2], almanac.seeds[1::2])
 	]
-	# TODO
-	return 0
+	composed_almanac = compose_almanac(almanac=almanac)
+	return min(
+		get_min_location(composed_almanac=composed_almanac, start=start, end=end)
+		for start, end in seed_intervals
+	)
 
 
 if __name__ == "__main__":
@@ -1,27 +1,104 @@
+import argparse
 import math
+import numpy as np
 from functools import reduce
 
+BATCH_EXACT_LIMIT = 1 << 31
+TIME = [46, 82, 84, 79]
+DISTANCE = [347, 1522, 1406, 1471]
 
-def get_solution_interval(a: int, b: int) -> (float, float):
+
+def count_winning_charge_times(time: int, distance: int) -> int:
+	"""
+	Method counting charging times beating the record, i.e. integer solutions of -t_c^2 + t*t_c - s > 0. The roots are
+	approximated with math.isqrt and then corrected, so charging times exactly matching the record are not counted.
+	The result does not depend on float precision, hence it is correct for arbitrarily large inputs.
+	:param time: race time
+	:param distance: current distance record
+	:return: number of charging times beating the record
+	"""
+	discriminant = time * time - 4 * distance
+	if discriminant < 0:
+		return 0
+	lowest = max((time - math.isqrt(discriminant)) // 2, 0)
+	while lowest * (time - lowest) <= distance and lowest <= time // 2:
+		lowest += 1
+	while lowest > 0 and (lowest - 1) * (time - lowest + 1) > distance:
+		lowest -= 1
+	if lowest > time // 2:
+		return 0
+	return time - 2 * lowest + 1
+
+
+def count_winning_charge_times_batch(times: np.ndarray, distances: np.ndarray) -> np.ndarray:
+	"""
+	Vectorized version of count_winning_charge_times for many races at once. Races with times small enough for the
+	squared time to fit into int64 are solved with float square roots corrected in integer arithmetic, remaining ones
+	fall back to the exact scalar solver.
+	:param times: array of race times
+	:param distances: array of distance records
+	:return: array with number of charging times beating the record for each race
+	"""
+	times = np.asarray(times, dtype=np.int64)
+	distances = np.asarray(distances, dtype=np.int64)
+	counts = np.zeros(len(times), dtype=np.int64)
+	is_small = (times < BATCH_EXACT_LIMIT) & (distances < BATCH_EXACT_LIMIT * BATCH_EXACT_LIMIT // 4)
+	time, distance = times[is_small], distances[is_small]
+	discriminant = np.maximum(time * time - 4 * distance, 0)
+	root = np.floor(np.sqrt(discriminant.astype(np.float64))).astype(np.int64)
+	for _ in range(2):
+		root = np.where(root * root > discriminant, root - 1, root)
+		root = np.where((root + 1) * (root + 1) <= discriminant, root + 1, root)
+	lowest = np.maximum((time - root) // 2, 0)
+	for _ in range(2):
+		lowest = np.where(lowest * (time - lowest) <= distance, lowest + 1, lowest)
+	lowest = np.where((lowest > 0) & ((lowest - 1) * (time - lowest + 1) > distance), lowest - 1, lowest)
+	counts[is_small] = np.where(lowest > time // 2, 0, time - 2 * lowest + 1)
+	counts[~is_small] = [
+		count_winning_charge_times(time=time, distance=distance)
+		for time, distance in zip(times[~is_small].tolist(), distances[~is_small].tolist())
+	]
+	return counts
+
+
+def parse_races(path: str) -> tuple[np.ndarray, np.ndarray]:
 	"""
-	Function returning soultion interval for inequality - x x + a x - b > 0 for given a, b
-	:param a: inequality parameter, max race time
-	:param b: inequality parameter, current distance record
-	:return: inequality soultion interval
+	Method loading race times and distance records from a file in the puzzle format, i.e. a "Time:" line and
+	a "Distance:" line with numbers separated by whitespaces, straight into arrays.
+	:param path: path to the input file
+	:return: array of times and array of distances
 	"""
-	return 0.5 * (a - pow(a * a - 4 * b, 0.5)), 0.5 * (a + pow(a * a - 4 * b, 0.5))
+	with open(path, "rb") as f:
+		time_line, distance_line = [line for line in f.read().split(b"\n") if len(line.strip()) > 0]
+	times = np.array(time_line.split(b":")[1].split()).astype(np.int64)
+	distances = np.array(distance_line.split(b":")[1].split()).astype(np.int64)
+	if len(times) != len(distances):
+		raise ValueError(f"Got {len(times)} race times, but {len(distances)} distance records")
+	return times, distances
 
 
-def get_natural_solutions_count(solution_interval: tuple[float, float]) -> float:
+def parse_input(path: str) -> tuple[list[int], list[int]]:
 	"""
-	Helper function returning number of integers in given interval
-	:param solution_interval: float solution interval
-	:return: a number of integers in given interval
+	Method loading race times and distance records as lists, as expected by part_one and part_two.
+	:param path: path to the input file
+	:return: list of times and list of distances
 	"""
-	return math.floor(solution_interval[-1]) - math.ceil(solution_interval[0]) + 1
+	times, distances = parse_races(path=path)
+	return times.tolist(), distances.tolist()
 
 
-def part_one(time: list[int], distance: list[int]) -> float:
+def solve_races_batch(path: str) -> np.ndarray:
+	"""
+	Method solving all races from a file at once with count_winning_charge_times_batch, meant for files with millions
+	of races, for which part_one and part_two are impractical.
+	:param path: path to the input file
+	:return: array with number of charging times beating the record for each race
+	"""
+	times, distances = parse_races(path=path)
+	return count_winning_charge_times_batch(times=times, distances=distances)
+
+
+def part_one(time: list[int], distance: list[int]) -> int:
 	"""
 	The problem presented in today's task may be described as finding the number of solutions for following formula:
 		-t_c^2 + t*t_c - s > 0,
@@ -33,11 +110,11 @@ def part_one(time: list[int], distance: list[int]) -> float:
 	"""
 	return reduce(
 		(lambda x, y: x * y),
-		[get_natural_solutions_count(solution_interval=get_solution_interval(t, d)) for t, d in zip(time, distance)]
+		[count_winning_charge_times(time=t, distance=d) for t, d in zip(time, distance)]
 	)
 
 
-def part_two(time: list[int], distance: list[int]) -> float:
+def part_two(time: list[int], distance: list[int]) -> int:
 	"""
 	This is the same problem, except the input must be modified first.
 	:param time: input time list
@@ -46,11 +123,29 @@ def part_two(time: list[int], distance: list[int]) -> float:
 	"""
 	time_parsed = int(''.join(map(str, time)))
 	distance_parsed = int(''.join(map(str, distance)))
-	return get_natural_solutions_count(solution_interval=get_solution_interval(time_parsed, distance_parsed))
+	return count_winning_charge_times(time=time_parsed, distance=distance_parsed)
 
 
 if __name__ == "__main__":
-	TIME = [46, 82, 84, 79]
-	DISTANCE = [347, 1522, 1406, 1471]
-	print(f"Part one: {part_one(time=TIME, distance=DISTANCE)}")
-	print(f"Part two: {part_two(time=TIME, distance=DISTANCE)}")
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--input", default=None, help="path to a file with races, built-in races are used by default")
+	parser.add_argument(
+		"--batch", action="store_true", help="solve races from --input with the vectorized solver and report their sum"
+	)
+	parser.add_argument("--counts-output", default=None, help="path to a file for per-race counts in batch mode")
+	args = parser.parse_args()
+	if args.batch:
+		if args.input is None:
+			parser.error("--batch requires --input")
+		races_counts = solve_races_batch(path=args.input)
+		if args.counts_output is not None:
+			with open(args.counts_output, "w") as f:
+				f.write("".join(f"{count}\n" for count in races_counts.tolist()))
+		print(f"Races: {len(races_counts)}")
+		print(f"Sum of winning charge times: {sum(races_counts.tolist())}")
+	else:
+		input_time, input_distance = TIME, DISTANCE
+		if args.input is not None:
+			input_time, input_distance = parse_input(path=args.input)
+		print(f"Part one: {part_one(time=input_time, distance=input_distance)}")
+		print(f"Part two: {part_two(time=input_time, distance=input_distance)}")
@@ -1,9 +1,22 @@
+import argparse
 import enum
+import os
+import tempfile
+import numpy as np
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 
 CARDS_ORDER_DESC_1 = ["A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"]
 CARDS_ORDER_DESC_2 = ["A", "K", "Q", "T", "9", "8", "7", "6", "5", "4", "3", "2", "J"]
 CARDS_WEIGHTS_DESC = ["m", "l", "k", "j", "i", "h", "g", "f", "e", "d", "c", "b", "a"]
+CARD_RANK_BITS = 4
+HAND_CARDS_COUNT = 5
+BID_BITS = 32
+RUN_SIZE = 1 << 22  # hands sorted in memory at once by the external ranking
+MERGE_BUFFER_SIZE = 1 << 22  # sort keys buffered in memory while merging sorted runs
+ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"  # characters separating fields for bytes.split()
+RANKED_BIDS_CHUNK_SIZE = 1 << 15  # bids below 2^32 weighted by ranks up to this size sum up to less than 2^62
 
 
 class HandType(enum.Enum):
@@ -22,6 +35,21 @@ class HandType(enum.Enum):
 		return self.value < other.value
 
 
+HAND_TYPE_BY_COUNTS = {
+	(5,): HandType.FIVE_OF_A_KIND,
+	(1, 4): HandType.FOUR_OF_A_KIND,
+	(2, 3): HandType.FULL_HOUSE,
+	(1, 1, 3): HandType.THREE_OF_A_KIND,
+	(1, 2, 2): HandType.TWO_PAIR,
+	(1, 1, 1, 2): HandType.ONE_PAIR,
+	(1, 1, 1, 1, 1): HandType.HIGH_CARD,
+}
+# Summing the occurrence count of every card in hand gives the sum of squared counts, which is unique for each type
+HAND_TYPE_BY_SQUARED_COUNTS = np.zeros(HAND_CARDS_COUNT ** 2 + 1, dtype=np.int64)
+for counts, hand_type in HAND_TYPE_BY_COUNTS.items():
+	HAND_TYPE_BY_SQUARED_COUNTS[sum(count * count for count in counts)] = hand_type.value
+
+
 @dataclass
 class Hand:
 	"""
@@ -47,6 +75,7 @@ class HandManager:
 	HandManager class to handle operations on cards in hands, such as hand type classification or cards substitution.
 	"""
 	ALL_ACES_HAND: str = "AAAAA"  # most valuable hand
+	JOKER_CARD: str = "J"
 
 	@staticmethod
 	def _parse_cards_to_cards_map(cards: str) -> dict:
@@ -60,27 +89,107 @@ class HandManager:
 			char: cards.count(char) for char in unique_chars
 		}
 
+	@staticmethod
+	@lru_cache(maxsize=None)
+	def _get_card_to_weight_map(cards_order: tuple[str, ...]) -> dict[str, str]:
+		"""
+		Helper method returning a card to weight letter dictionary for given cards order, built once per order.
+		:param cards_order: tuple representing cards order
+		:return: card to weight dictionary
+		"""
+		return {card: weight for card, weight in zip(cards_order, CARDS_WEIGHTS_DESC)}
+
+	@staticmethod
+	@lru_cache(maxsize=None)
+	def _get_card_to_rank_map(cards_order: tuple[str, ...]) -> dict[str, int]:
+		"""
+		Helper method returning a card to integer rank dictionary for given cards order (the weakest card gets 0),
+		built once per order.
+		:param cards_order: tuple representing cards order
+		:return: card to rank dictionary
+		"""
+		return {card: len(cards_order) - 1 - idx for idx, card in enumerate(cards_order)}
+
+	@staticmethod
+	@lru_cache(maxsize=None)
+	def _get_byte_to_rank_array(cards_order: tuple[str, ...]) -> np.ndarray:
+		"""
+		Helper method returning an array mapping ASCII codes of cards to their integer ranks, built once per order.
+		Codes of characters which are not cards map to -1.
+		:param cards_order: tuple representing cards order
+		:return: rank lookup array
+		"""
+		byte_to_rank = np.full(256, -1, dtype=np.int64)
+		for idx, card in enumerate(cards_order):
+			byte_to_rank[ord(card)] = len(cards_order) - 1 - idx
+		return byte_to_rank
+
 	@classmethod
 	def classify_hand(cls, cards: str) -> HandType:
 		"""
-		Method to classify hand type (full house, two pair, etc.) based on cards in hand.
+		Method to classify hand type (full house, two pair, etc.) based on cards in hand. The type is looked up by the
+		sorted card occurrence counts, e.g. (2, 3) for a full house.
 		Possible card combinations: AAAAA AAAAB AAABB AAABC AABBC AABCD ABCDE
 		:return: HandType, type of hand (e.g. FULL_HOUSE, TWO_PAIR)
 		"""
-		cards_map = cls._parse_cards_to_cards_map(cards=cards)
-		if len(cards_map) == 1:
-			return HandType.FIVE_OF_A_KIND
-		if len(cards_map) == 2 and min(cards_map.values()) == 2:
-			return HandType.FULL_HOUSE
-		if len(cards_map) == 2:
-			return HandType.FOUR_OF_A_KIND
-		if len(cards_map) == 3 and max(cards_map.values()) == 3:
-			return HandType.THREE_OF_A_KIND
-		if len(cards_map) == 3:
-			return HandType.TWO_PAIR
-		if len(cards_map) == 4:
-			return HandType.ONE_PAIR
-		return HandType.HIGH_CARD
+		return HAND_TYPE_BY_COUNTS[tuple(sorted(cards.count(char) for char in set(cards)))]
+
+	@classmethod
+	def pack_hand(cls, cards: str, cards_order: list[str] | None = None, with_jokers: bool = False) -> int:
+		"""
+		Method to encode hand as a single integer with hand type in the high bits followed by 4-bit ranks of the five
+		cards. Comparing packed hands as integers is equivalent to comparing Hand objects.
+		:param cards: string with cards
+		:param cards_order: list representing cards order
+		:param with_jokers: whether hand type should be determined after substituting jokers
+		:return: packed hand
+		"""
+		if cards_order is None:
+			cards_order = CARDS_ORDER_DESC_1
+		card_to_rank_map = cls._get_card_to_rank_map(tuple(cards_order))
+		cards_classified = cls.substitute_jokers(cards=cards) if with_jokers else cards
+		packed_hand = cls.classify_hand(cards=cards_classified).value
+		for card in cards:
+			packed_hand = (packed_hand << CARD_RANK_BITS) | card_to_rank_map[card]
+		return packed_hand
+
+	@classmethod
+	def pack_hands(
+			cls, cards: list[str], cards_order: list[str] | None = None, with_jokers: bool = False
+	) -> np.ndarray:
+		"""
+		Vectorized version of pack_hand encoding all hands at once. With jokers, substituting them with the most common
+		other card is equivalent to adding the jokers count to the highest non-joker card count.
+		:param cards: list of strings with cards
+		:param cards_order: list representing cards order
+		:param with_jokers: whether hand type should be determined after substituting jokers
+		:return: array of packed hands
+		:raises ValueError: if a hand does not consist of HAND_CARDS_COUNT cards from cards_order
+		"""
+		if cards_order is None:
+			cards_order = CARDS_ORDER_DESC_1
+		hand_lengths = np.fromiter(map(len, cards), dtype=np.int64, count=len(cards))
+		invalid_hands = np.flatnonzero(hand_lengths != HAND_CARDS_COUNT)
+		if len(invalid_hands) > 0:
+			raise ValueError(f"Hand {cards[invalid_hands[0]]!r} does not consist of {HAND_CARDS_COUNT} cards")
+		# non-ASCII characters are replaced with "?", which is not a card either, so every hand keeps its length
+		cards_bytes = np.frombuffer("".join(cards).encode("ascii", errors="replace"), dtype=np.uint8)
+		cards_bytes = cards_bytes.reshape(-1, HAND_CARDS_COUNT)
+		ranks = cls._get_byte_to_rank_array(tuple(cards_order))[cards_bytes]
+		invalid_hands = np.flatnonzero((ranks < 0).any(axis=1))
+		if len(invalid_hands) > 0:
+			raise ValueError(f"Hand {cards[invalid_hands[0]]!r} contains cards other than {''.join(cards_order)}")
+		if with_jokers:
+			is_joker = cards_bytes == ord(cls.JOKER_CARD)
+			counts = ((ranks[:, :, None] == ranks[:, None, :]) & ~is_joker[:, None, :]).sum(axis=2) * ~is_joker
+			max_counts = counts.max(axis=1)
+			squared_counts = counts.sum(axis=1) - max_counts ** 2 + (max_counts + is_joker.sum(axis=1)) ** 2
+		else:
+			squared_counts = (ranks[:, :, None] == ranks[:, None, :]).sum(axis=(1, 2))
+		packed_hands = HAND_TYPE_BY_SQUARED_COUNTS[squared_counts]
+		for card_idx in range(HAND_CARDS_COUNT):
+			packed_hands = (packed_hands << CARD_RANK_BITS) | ranks[:, card_idx]
+		return packed_hands
 
 	@classmethod
 	def substitute_jokers(cls, cards: str) -> str:
@@ -108,18 +217,88 @@ class HandManager:
 		"""
 		if cards_order is None:
 			cards_order = CARDS_ORDER_DESC_1
-		CARD_TO_WEIGHT_MAP = {
-			card: weight for card, weight in zip(cards_order, CARDS_WEIGHTS_DESC)
-		}
-		return "".join([CARD_TO_WEIGHT_MAP[card] for card in cards])
+		card_to_weight_map = cls._get_card_to_weight_map(tuple(cards_order))
+		return "".join([card_to_weight_map[card] for card in cards])
+
+
+@dataclass
+class HandsTable:
+	"""
+	Columnar representation of hands with packed hands computed for both rule sets.
+	:param packed_hands: array of hands packed with standard rules
+	:param packed_hands_with_jokers: array of hands packed with joker rules
+	:param bids: array of bids
+	"""
+	packed_hands: np.ndarray
+	packed_hands_with_jokers: np.ndarray
+	bids: np.ndarray
+
+
+def pack_hands_table(cards: list[str], bids: np.ndarray) -> HandsTable:
+	"""
+	Method encoding hands under both rule sets.
+	:param cards: list of strings with cards
+	:param bids: array of bids
+	:return: hands table
+	"""
+	return HandsTable(
+		packed_hands=HandManager.pack_hands(cards=cards, cards_order=CARDS_ORDER_DESC_1),
+		packed_hands_with_jokers=HandManager.pack_hands(cards=cards, cards_order=CARDS_ORDER_DESC_2, with_jokers=True),
+		bids=bids
+	)
+
+
+def build_hands_table(hands: list[Hand]) -> HandsTable:
+	"""
+	Method encoding hands under both rule sets without modifying Hand objects.
+	:param hands: list of Hand objects
+	:return: hands table
+	"""
+	bids = np.array([hand.bid for hand in hands], dtype=np.int64)
+	return pack_hands_table(cards=[hand.cards for hand in hands], bids=bids)
+
+
+def split_hand_lines(data: bytes, first_line_number: int = 1) -> tuple[list[str], np.ndarray]:
+	"""
+	Helper method splitting input lines into cards and bids with a single split of the whole data. Blank lines are
+	skipped, any other line has to consist of a hand and a bid, which is checked by counting starts of fields in every
+	line with numpy.
+	:param data: input lines
+	:param first_line_number: number of the first line in the input, used in error messages
+	:return: list of strings with cards and array of bids
+	"""
+	data_bytes = np.frombuffer(data, dtype=np.uint8)
+	is_whitespace = np.isin(data_bytes, np.frombuffer(ASCII_WHITESPACE, dtype=np.uint8))
+	is_field_start = ~is_whitespace
+	is_field_start[1:] &= is_whitespace[:-1]
+	line_indices = np.cumsum(data_bytes == ord("\n"))
+	fields_per_line = np.bincount(line_indices[is_field_start])
+	invalid_lines = np.flatnonzero((fields_per_line != 0) & (fields_per_line != 2))
+	if len(invalid_lines) > 0:
+		line = data.split(b"\n")[invalid_lines[0]].decode(errors="replace").strip()
+		raise ValueError(f"Line {first_line_number + invalid_lines[0]} does not consist of a hand and a bid: {line!r}")
+	fields = data.split()
+	return [cards.decode() for cards in fields[0::2]], np.array(fields[1::2]).astype(np.int64)
 
 
-def parse_input() -> list[Hand]:
+def parse_hands_table(path: str = "./input.txt") -> HandsTable:
+	"""
+	Method parsing the input straight into a hands table, in a single pass without Hand objects.
+	:param path: path to the input file
+	:return: hands table
+	"""
+	with open(path, "rb") as f:
+		cards, bids = split_hand_lines(data=f.read())
+	return pack_hands_table(cards=cards, bids=bids)
+
+
+def parse_input(path: str = "./input.txt") -> list[Hand]:
 	"""
 	Method to load input from file and parse it into Hand objects.
+	:param path: path to the input file
 	:return: list of Hand objects
 	"""
-	with open("./input.txt", "r") as f:
+	with open(path, "r") as f:
 		lines = [line.split(" ") for line in f.readlines()]
 		hands = [Hand(
 			type=HandManager.classify_hand(cards=line[0]),
@@ -130,19 +309,153 @@ def parse_input() -> list[Hand]:
 	return hands
 
 
-def part_one(hands: list[Hand]) -> int:
-	return sum([(order + 1) * hand.bid for order, hand in enumerate(sorted(hands))])
+def get_total_winnings(packed_hands: np.ndarray, bids: np.ndarray) -> int:
+	"""
+	Method ranking packed hands and summing bids multiplied by ranks. Each bid is stored in the low bits of its sort
+	key, so ranking is a plain sort of integers.
+	:param packed_hands: array of packed hands
+	:param bids: array of bids corresponding to packed hands
+	:return: total winnings
+	"""
+	keys = np.sort(get_sort_keys(packed_hands=packed_hands, bids=bids))
+	return get_ranked_bids_sum(bids=keys & ((1 << BID_BITS) - 1))
+
+
+def get_ranked_bids_sum(bids: np.ndarray, first_rank: int = 1) -> int:
+	"""
+	Helper method summing bids multiplied by consecutive ranks without int64 overflow. Bids are split into chunks of
+	RANKED_BIDS_CHUNK_SIZE and ranked from 1 within every chunk, so the int64 sums of a chunk stay below 2^62; ranks
+	preceding a chunk are added in Python integers as the offset multiplied by the sum of its bids.
+	:param bids: array of bids in the order of ranks, each lower than 2^BID_BITS
+	:param first_rank: rank of the first bid
+	:return: sum of rank * bid
+	"""
+	full_count = len(bids) - len(bids) % RANKED_BIDS_CHUNK_SIZE
+	chunks = np.asarray(bids[:full_count], dtype=np.int64).reshape(-1, RANKED_BIDS_CHUNK_SIZE)
+	tail = np.asarray(bids[full_count:], dtype=np.int64)
+	chunk_ranks = np.arange(1, RANKED_BIDS_CHUNK_SIZE + 1, dtype=np.int64)
+	ranked_sum = sum((chunks @ chunk_ranks).tolist()) + int(tail @ chunk_ranks[:len(tail)])
+	chunk_offsets = range(first_rank - 1, first_rank - 1 + len(bids), RANKED_BIDS_CHUNK_SIZE)
+	bid_sums = chunks.sum(axis=1).tolist() + [int(tail.sum())]
+	return ranked_sum + sum(offset * bid_sum for offset, bid_sum in zip(chunk_offsets, bid_sums))
+
+
+def get_sort_keys(packed_hands: np.ndarray, bids: np.ndarray) -> np.ndarray:
+	"""
+	Helper method combining packed hands with bids into keys, which sort in the order of ranks. Bids are stored in the
+	low BID_BITS bits, so they have to be non-negative and lower than 2^BID_BITS.
+	:param packed_hands: array of packed hands
+	:param bids: array of bids corresponding to packed hands
+	:return: array of sort keys
+	"""
+	bids = np.asarray(bids, dtype=np.int64)
+	invalid_bids = bids[(bids < 0) | (bids >= 1 << BID_BITS)]
+	if len(invalid_bids) > 0:
+		raise ValueError(f"Bid {invalid_bids[0]} does not fit into {BID_BITS} bits of a sort key")
+	return (np.asarray(packed_hands, dtype=np.int64) << BID_BITS) | bids
+
+
+def write_sorted_runs(path: str, run_dir: str, run_size: int = RUN_SIZE) -> list[tuple[str, str]]:
+	"""
+	Method reading the input in chunks of run_size hands, sorting sort keys of each chunk under both rule sets and
+	writing them to binary run files, so that at most one chunk is kept in memory. Blank lines are skipped, any other
+	line has to consist of a hand and a bid.
+	:param path: path to the input file
+	:param run_dir: directory for the run files
+	:param run_size: number of hands per run
+	:return: list of (run path with standard rules, run path with joker rules) pairs
+	"""
+	run_paths = []
+	lines_count = 0
+	with open(path, "rb") as f:
+		while len(lines := list(islice(f, run_size))) > 0:
+			cards, bids = split_hand_lines(data=b"".join(lines), first_line_number=lines_count + 1)
+			lines_count += len(lines)
+			run_path = os.path.join(run_dir, f"run{len(run_paths)}")
+			packed_hands = HandManager.pack_hands(cards=cards, cards_order=CARDS_ORDER_DESC_1)
+			np.sort(get_sort_keys(packed_hands=packed_hands, bids=bids)).tofile(run_path + "_standard.bin")
+			packed_hands = HandManager.pack_hands(cards=cards, cards_order=CARDS_ORDER_DESC_2, with_jokers=True)
+			np.sort(get_sort_keys(packed_hands=packed_hands, bids=bids)).tofile(run_path + "_jokers.bin")
+			run_paths.append((run_path + "_standard.bin", run_path + "_jokers.bin"))
+	return run_paths
+
+
+def merge_runs(run_paths: list[str], buffer_size: int = MERGE_BUFFER_SIZE) -> int:
+	"""
+	Method merging sorted runs of sort keys and accumulating rank * bid on the fly. Every run is read in blocks; in each
+	step all buffered keys not greater than the smallest last buffered key of any run are final, so they are sorted
+	together, ranked and dropped. The run providing that smallest key is exhausted in every step, so memory stays
+	bounded by buffer_size keys and the number of steps by the number of blocks.
+	:param run_paths: paths to files with sorted int64 sort keys
+	:param buffer_size: total number of keys buffered across runs
+	:return: total winnings
+	"""
+	block_size = max(1, buffer_size // max(1, len(run_paths)))
+	offsets = [0] * len(run_paths)
+	buffers = [np.empty(0, dtype=np.int64)] * len(run_paths)
+	total_winnings = 0
+	ranked_count = 0
+	while True:
+		for idx, run_path in enumerate(run_paths):
+			if len(buffers[idx]) == 0:
+				buffers[idx] = np.fromfile(run_path, dtype=np.int64, count=block_size, offset=offsets[idx] * 8)
+				offsets[idx] += len(buffers[idx])
+		active = [idx for idx, buffer in enumerate(buffers) if len(buffer) > 0]
+		if len(active) == 0:
+			return total_winnings
+		threshold = min(buffers[idx][-1] for idx in active)
+		final_keys = []
+		for idx in active:
+			final_count = int(np.searchsorted(buffers[idx], threshold, side="right"))
+			final_keys.append(buffers[idx][:final_count])
+			buffers[idx] = buffers[idx][final_count:]
+		final_keys = np.sort(np.concatenate(final_keys))
+		total_winnings += get_ranked_bids_sum(bids=final_keys & ((1 << BID_BITS) - 1), first_rank=ranked_count + 1)
+		ranked_count += len(final_keys)
+
+
+def get_total_winnings_external(
+		path: str = "./input.txt", run_size: int = RUN_SIZE, buffer_size: int = MERGE_BUFFER_SIZE,
+		work_dir: str | None = None
+) -> tuple[int, int]:
+	"""
+	Method computing answers to both parts with memory bounded by run_size and buffer_size rather than by the number
+	of hands, by sorting runs of the input into temporary files and merging them. Answers equal part_one and part_two.
+	:param path: path to the input file
+	:param run_size: number of hands sorted in memory at once
+	:param buffer_size: number of sort keys buffered while merging
+	:param work_dir: directory for temporary run files, system temporary directory by default
+	:return: answers to part one and part two
+	"""
+	with tempfile.TemporaryDirectory(dir=work_dir) as run_dir:
+		run_paths = write_sorted_runs(path=path, run_dir=run_dir, run_size=run_size)
+		return (
+			merge_runs(run_paths=[standard_path for standard_path, _ in run_paths], buffer_size=buffer_size),
+			merge_runs(run_paths=[jokers_path for _, jokers_path in run_paths], buffer_size=buffer_size)
+		)
+
+
+def part_one(hands: list[Hand] | HandsTable) -> int:
+	hands_table = hands if isinstance(hands, HandsTable) else build_hands_table(hands=hands)
+	return get_total_winnings(packed_hands=hands_table.packed_hands, bids=hands_table.bids)
 
 
-def part_two(hands: list[Hand]) -> int:
-	for hand in hands:
-		hand.cards_weighted = HandManager.get_cards_weighted(cards=hand.cards, cards_order=CARDS_ORDER_DESC_2)
-		hand.cards = HandManager.substitute_jokers(cards=hand.cards)
-		hand.type = HandManager.classify_hand(cards=hand.cards)
-	return sum([(order + 1) * hand.bid for order, hand in enumerate(sorted(hands))])
+def part_two(hands: list[Hand] | HandsTable) -> int:
+	hands_table = hands if isinstance(hands, HandsTable) else build_hands_table(hands=hands)
+	return get_total_winnings(packed_hands=hands_table.packed_hands_with_jokers, bids=hands_table.bids)
 
 
 if __name__ == "__main__":
-	input_hands = parse_input()
-	print(f"Part one: {part_one(hands=input_hands)}")
-	print(f"Part two: {part_two(hands=input_hands)}")
+	parser = argparse.ArgumentParser()
+	parser.add_argument(
+		"--external", action="store_true", help="rank hands through sorted runs on disk, with bounded memory"
+	)
+	parser.add_argument("--run-size", type=int, default=RUN_SIZE, help="number of hands sorted in memory at once")
+	args = parser.parse_args()
+	if args.external:
+		answer_one, answer_two = get_total_winnings_external(run_size=args.run_size)
+	else:
+		input_hands_table = parse_hands_table()
+		answer_one, answer_two = part_one(hands=input_hands_table), part_two(hands=input_hands_table)
+	print(f"Part one: {answer_one}")
+	print(f"Part two: {answer_two}")
@@ -1,5 +1,7 @@
+import math
 import re
-from dataclasses import dataclass
+import numpy as np
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -8,14 +10,47 @@ class Map:
 	network: dict[str, (str, str)]
 
 
+@dataclass
+class IndexedMap:
+	"""
+	Class representing a map with node names interned to integer ids.
+	:param instruction: string with instructions
+	:param node_names: list of node names, indexed by node id
+	:param node_ids: dictionary mapping node names to node ids
+	:param left: array with id of the left neighbour of each node
+	:param right: array with id of the right neighbour of each node
+	:param sweep: array with id of the node reached from each node after following the whole instruction once
+	"""
+	instruction: str
+	node_names: list[str]
+	node_ids: dict[str, int]
+	left: np.ndarray
+	right: np.ndarray
+	sweep: np.ndarray
+
+
+@dataclass
+class DoublingTable:
+	"""
+	Class representing a binary lifting table over walk states. A state encodes a node and a position in the
+	instruction as node_id * len(instruction) + instruction offset.
+	:param instruction_length: length of the instruction
+	:param jumps: list of arrays, jumps[k][state] is the state reached from given state after 2^k steps
+	"""
+	instruction_length: int
+	jumps: list[np.ndarray]
+
+
 @dataclass
 class NodesStats:
 	cycle_length: int
 	terminal_nodes_occurrence: list[int]
+	cycle_start: int = 0
+	pre_cycle_terminal_nodes_occurrence: list[int] = field(default_factory=list)
 
 
-def parse_input_graph() -> Map:
-	with open("./input.txt", "r") as f:
+def parse_input_graph(path: str = "./input.txt") -> Map:
+	with open(path, "r") as f:
 		lines = f.read()
 	instruction_regex = r"[LR]+"
 	network_regex = r"([0-9A-Z]{3}) = \(([0-9A-Z]{3}), ([0-9A-Z]{3})\)"
@@ -30,21 +65,252 @@ def parse_input_graph() -> Map:
 	)
 
 
+def index_map(input_map: Map) -> IndexedMap:
+	"""
+	Method interning node names to integer ids and storing the network as two arrays of neighbour ids. The transition
+	after a full instruction sweep is precomputed for all nodes at once, one vectorized lookup per instruction.
+	:param input_map: parsed map
+	:return: indexed map
+	"""
+	node_names = list(input_map.network.keys())
+	node_ids = {node_name: node_id for node_id, node_name in enumerate(node_names)}
+	left = np.array([node_ids[left_node] for left_node, _ in input_map.network.values()], dtype=np.int64)
+	right = np.array([node_ids[right_node] for _, right_node in input_map.network.values()], dtype=np.int64)
+	sweep = np.arange(len(node_names), dtype=np.int64)
+	for direction in input_map.instruction:
+		sweep = left[sweep] if direction == "L" else right[sweep]
+	return IndexedMap(
+		instruction=input_map.instruction,
+		node_names=node_names,
+		node_ids=node_ids,
+		left=left,
+		right=right,
+		sweep=sweep
+	)
+
+
+def get_first_terminal_offsets(indexed_map: IndexedMap, is_terminal: np.ndarray) -> np.ndarray:
+	"""
+	Method computing, for every node, the first step within a single instruction sweep starting at that node at which
+	a terminal node is reached.
+	:param indexed_map: indexed map
+	:param is_terminal: boolean array marking terminal nodes
+	:return: array of first offsets in range [1, len(instruction)], -1 for sweeps not reaching any terminal node
+	"""
+	first_offsets = np.full(len(indexed_map.node_names), -1, dtype=np.int64)
+	positions = np.arange(len(indexed_map.node_names), dtype=np.int64)
+	for offset, direction in enumerate(indexed_map.instruction, start=1):
+		positions = indexed_map.left[positions] if direction == "L" else indexed_map.right[positions]
+		first_offsets[(first_offsets == -1) & is_terminal[positions]] = offset
+	return first_offsets
+
+
+def get_terminal_offsets(indexed_map: IndexedMap, node_id: int, is_terminal: np.ndarray) -> list[int]:
+	"""
+	Helper method listing all steps within a single instruction sweep starting at given node at which a terminal node
+	is reached.
+	:param indexed_map: indexed map
+	:param node_id: id of the node the sweep starts at
+	:param is_terminal: boolean array marking terminal nodes
+	:return: list of offsets in range [1, len(instruction)]
+	"""
+	terminal_offsets = []
+	for offset, direction in enumerate(indexed_map.instruction, start=1):
+		node_id = indexed_map.left[node_id] if direction == "L" else indexed_map.right[node_id]
+		if is_terminal[node_id]:
+			terminal_offsets.append(offset)
+	return terminal_offsets
+
+
+def get_nodes_stats(
+		indexed_map: IndexedMap, starting_node_id: int, is_terminal: np.ndarray, first_offsets: np.ndarray
+) -> NodesStats:
+	"""
+	Method detecting the cycle of a walk starting at given node. The walk is tracked at instruction sweep boundaries,
+	where the state is fully described by the node, so the first repeated node closes the cycle. Steps at which
+	terminal nodes are reached are recorded separately before the cycle and within its first pass.
+	:param indexed_map: indexed map
+	:param starting_node_id: id of the starting node
+	:param is_terminal: boolean array marking terminal nodes
+	:param first_offsets: result of get_first_terminal_offsets for the same terminal nodes
+	:return: statistics of the walk
+	"""
+	instruction_length = len(indexed_map.instruction)
+	sweep_idx_by_node = {}
+	sweep_start_nodes = []
+	node_id = starting_node_id
+	while node_id not in sweep_idx_by_node:
+		sweep_idx_by_node[node_id] = len(sweep_start_nodes)
+		sweep_start_nodes.append(node_id)
+		node_id = int(indexed_map.sweep[node_id])
+	cycle_start_sweep = sweep_idx_by_node[node_id]
+	occurrences = [
+		sweep_idx * instruction_length + offset
+		for sweep_idx, sweep_start_node in enumerate(sweep_start_nodes)
+		if first_offsets[sweep_start_node] != -1
+		for offset in get_terminal_offsets(indexed_map=indexed_map, node_id=sweep_start_node, is_terminal=is_terminal)
+	]
+	cycle_start = cycle_start_sweep * instruction_length
+	return NodesStats(
+		cycle_length=(len(sweep_start_nodes) - cycle_start_sweep) * instruction_length,
+		terminal_nodes_occurrence=[occurrence for occurrence in occurrences if occurrence > cycle_start],
+		cycle_start=cycle_start,
+		pre_cycle_terminal_nodes_occurrence=[occurrence for occurrence in occurrences if occurrence <= cycle_start]
+	)
+
+
+def is_terminal_step(nodes_stats: NodesStats, step: int) -> bool:
+	"""
+	Helper method checking whether a walk described by given statistics is at a terminal node after given step.
+	:param nodes_stats: statistics of the walk
+	:param step: step count
+	:return: True if the walk is at a terminal node
+	"""
+	if step <= nodes_stats.cycle_start:
+		return step in nodes_stats.pre_cycle_terminal_nodes_occurrence
+	return any(
+		(step - occurrence) % nodes_stats.cycle_length == 0
+		for occurrence in nodes_stats.terminal_nodes_occurrence
+	)
+
+
+def combine_congruences(first: tuple[int, int], second: tuple[int, int]) -> tuple[int, int] | None:
+	"""
+	Helper method combining two congruences x = r1 (mod m1), x = r2 (mod m2) into one, using the Chinese remainder
+	theorem generalized to moduli which are not coprime.
+	:param first: tuple (r1, m1)
+	:param second: tuple (r2, m2)
+	:return: tuple (r, lcm(m1, m2)) or None if the congruences are contradictory
+	"""
+	remainder_1, modulus_1 = first
+	remainder_2, modulus_2 = second
+	gcd = math.gcd(modulus_1, modulus_2)
+	if (remainder_2 - remainder_1) % gcd != 0:
+		return None
+	lcm = modulus_1 // gcd * modulus_2
+	multiplier = (remainder_2 - remainder_1) // gcd * pow(modulus_1 // gcd, -1, modulus_2 // gcd) % (modulus_2 // gcd)
+	return (remainder_1 + modulus_1 * multiplier) % lcm, lcm
+
+
+def build_doubling_table(indexed_map: IndexedMap, max_steps: int) -> DoublingTable:
+	"""
+	Method building a binary lifting table able to answer queries of up to max_steps steps. Each level is computed
+	from the previous one by composing it with itself. The table holds len(node_names) * len(instruction) states per
+	level and log2(max_steps) levels.
+	:param indexed_map: indexed map
+	:param max_steps: maximal number of steps of a query
+	:return: doubling table
+	"""
+	instruction_length = len(indexed_map.instruction)
+	nodes = np.repeat(np.arange(len(indexed_map.node_names), dtype=np.int64), instruction_length)
+	offsets = np.tile(np.arange(instruction_length, dtype=np.int64), len(indexed_map.node_names))
+	is_left = np.array([direction == "L" for direction in indexed_map.instruction], dtype=bool)[offsets]
+	next_nodes = np.where(is_left, indexed_map.left[nodes], indexed_map.right[nodes])
+	jumps = [next_nodes * instruction_length + (offsets + 1) % instruction_length]
+	while len(jumps) < max(max_steps, 1).bit_length():
+		jumps.append(jumps[-1][jumps[-1]])
+	return DoublingTable(
+		instruction_length=instruction_length,
+		jumps=jumps
+	)
+
+
+def get_positions(
+		indexed_map: IndexedMap, doubling_table: DoublingTable, starting_nodes: list[str], steps: list[int]
+) -> list[str]:
+	"""
+	Method answering many "where is a walker starting at node X after K steps" queries at once. Every query is answered
+	in O(log K) by applying the jumps corresponding to set bits of K, all queries are processed together level by level.
+	:param indexed_map: indexed map
+	:param doubling_table: doubling table built for at least max(steps) steps
+	:param starting_nodes: list of starting node names
+	:param steps: list of step counts corresponding to starting nodes
+	:return: list of node names reached by the walkers
+	"""
+	steps = np.array(steps, dtype=np.int64)
+	if len(steps) > 0 and int(steps.min()) < 0:
+		raise ValueError(f"Step counts have to be non-negative, got {int(steps.min())}")
+	if len(steps) > 0 and int(steps.max()) >= 1 << len(doubling_table.jumps):
+		raise ValueError(f"Doubling table supports at most {(1 << len(doubling_table.jumps)) - 1} steps")
+	states = np.array(
+		[indexed_map.node_ids[starting_node] for starting_node in starting_nodes], dtype=np.int64
+	) * doubling_table.instruction_length
+	for level, jumps in enumerate(doubling_table.jumps):
+		is_jumping = (steps >> level) & 1 == 1
+		states[is_jumping] = jumps[states[is_jumping]]
+	return [indexed_map.node_names[node_id] for node_id in states // doubling_table.instruction_length]
+
+
+def get_position(indexed_map: IndexedMap, doubling_table: DoublingTable, starting_node: str, steps: int) -> str:
+	"""
+	Method returning the node a walker starting at given node reaches after given number of steps.
+	:param indexed_map: indexed map
+	:param doubling_table: doubling table built for at least given number of steps
+	:param starting_node: starting node name
+	:param steps: number of steps
+	:return: node name reached by the walker
+	"""
+	return get_positions(
+		indexed_map=indexed_map, doubling_table=doubling_table, starting_nodes=[starting_node], steps=[steps]
+	)[0]
+
+
 def part_one(input_map: Map, starting_node: str, target_node: str) -> int:
-	current_node = starting_node
-	instruction_idx = 0
-	steps_count = 0
-	while current_node != target_node:
-		current_node = input_map.network[current_node][0] \
-			if input_map.instruction[instruction_idx] == "L" \
-			else input_map.network[current_node][1]
-		steps_count += 1
-		instruction_idx = (instruction_idx + 1) % len(input_map.instruction)
-	return steps_count
+	indexed_map = index_map(input_map=input_map)
+	is_terminal = np.zeros(len(indexed_map.node_names), dtype=bool)
+	is_terminal[indexed_map.node_ids[target_node]] = True
+	first_offsets = get_first_terminal_offsets(indexed_map=indexed_map, is_terminal=is_terminal)
+	node_id = indexed_map.node_ids[starting_node]
+	if node_id == indexed_map.node_ids[target_node]:
+		return 0
+	for sweep_idx in range(len(indexed_map.node_names)):
+		if first_offsets[node_id] != -1:
+			return sweep_idx * len(indexed_map.instruction) + int(first_offsets[node_id])
+		node_id = int(indexed_map.sweep[node_id])
+	raise ValueError(f"Node {target_node} is not reachable from node {starting_node}")
 
 
 def part_two(input_map: Map) -> int:
-	pass
+	"""
+	All walks starting at nodes ending with A have to be at nodes ending with Z at the same time. Each walk is reduced
+	to its cycle statistics, then steps at which all walks are at terminal nodes are found with the Chinese remainder
+	theorem instead of simulating the walks.
+	:param input_map: parsed map
+	:return: number of steps after which all walks are at nodes ending with Z
+	"""
+	indexed_map = index_map(input_map=input_map)
+	is_terminal = np.array([node_name.endswith("Z") for node_name in indexed_map.node_names], dtype=bool)
+	first_offsets = get_first_terminal_offsets(indexed_map=indexed_map, is_terminal=is_terminal)
+	walks_stats = [
+		get_nodes_stats(
+			indexed_map=indexed_map, starting_node_id=node_id, is_terminal=is_terminal, first_offsets=first_offsets
+		)
+		for node_id, node_name in enumerate(indexed_map.node_names) if node_name.endswith("A")
+	]
+	candidates = [
+		step
+		for nodes_stats in walks_stats
+		for step in nodes_stats.pre_cycle_terminal_nodes_occurrence
+		if all(is_terminal_step(nodes_stats=other_stats, step=step) for other_stats in walks_stats)
+	]
+	congruences = [(0, 1)]
+	for nodes_stats in walks_stats:
+		congruences = [
+			combined
+			for congruence in congruences
+			for occurrence in nodes_stats.terminal_nodes_occurrence
+			if (combined := combine_congruences(congruence, (occurrence, nodes_stats.cycle_length))) is not None
+		]
+	min_step = max(nodes_stats.cycle_start for nodes_stats in walks_stats) + 1
+	for remainder, modulus in congruences:
+		candidates.append(remainder + (min_step - remainder + modulus - 1) // modulus * modulus)
+	candidates = [
+		step for step in candidates
+		if all(is_terminal_step(nodes_stats=nodes_stats, step=step) for nodes_stats in walks_stats)
+	]
+	if len(candidates) == 0:
+		raise ValueError("Walks never reach nodes ending with Z at the same time")
+	return min(candidates)
 
 
 if __name__ == "__main__":
@@ -1,43 +1,234 @@
+import argparse
+import math
+import os
 import re
+import sys
+import numpy as np
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable
 
+if __name__ == "__main__":  # run as a script from the day directory, the repository root is not on the path then
+	sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.sharding import solve_parallel  # noqa: E402
+from aoc.tokenizer import tokenize_integers  # noqa: E402
 
-def part_one(values_history: list[list[int]]) -> int:
-	sum_of_predictions = 0
+INT64_LIMIT = 2 ** 63 - 1
+
+
+def predict_next(value_history: list[int]) -> int:
+	"""
+	Helper method extrapolating the next value of a single history using the difference pyramid.
+	:param value_history: list of values
+	:return: predicted next value
+	"""
+	value_history_step = value_history
+	last_from_step = [value_history_step[-1]]
+	while set(value_history_step) != {0}:
+		value_history_step = [v2 - v1 for v1, v2 in zip(value_history_step[:-1], value_history_step[1:])]
+		last_from_step.append(value_history_step[-1])
+	return sum(last_from_step)
+
+
+def predict_previous(value_history: list[int]) -> int:
+	"""
+	Helper method extrapolating the value preceding a single history using the difference pyramid.
+	:param value_history: list of values
+	:return: predicted previous value
+	"""
+	value_history_step = value_history
+	first_from_step = [value_history_step[0]]
+	while set(value_history_step) != {0}:
+		value_history_step = [v2 - v1 for v1, v2 in zip(value_history_step[:-1], value_history_step[1:])]
+		first_from_step.append(value_history_step[0])
+	cur_pred_val = 0
+	for val in first_from_step[::-1]:
+		cur_pred_val = val - cur_pred_val
+	return cur_pred_val
+
+
+@lru_cache(maxsize=None)
+def get_extrapolation_weights(length: int) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	Helper method returning weights of the closed-form extrapolation for histories of given length. For a history
+	x_0, ..., x_{n-1} described by a polynomial of degree lower than n, the next value equals
+	sum((-1)^(n-1-i) * C(n, i) * x_i) and the previous value equals sum((-1)^i * C(n, i+1) * x_i).
+	Weights are kept as Python integers (object arrays), since binomial coefficients outgrow int64 for long histories.
+	:param length: length of the history
+	:return: weights for the next value and weights for the previous value
+	"""
+	next_weights = np.array([(-1) ** (length - 1 - i) * math.comb(length, i) for i in range(length)], dtype=object)
+	previous_weights = np.array([(-1) ** i * math.comb(length, i + 1) for i in range(length)], dtype=object)
+	return next_weights, previous_weights
+
+
+def extrapolate(values_history: list[list[int]]) -> tuple[int, int]:
+	"""
+	Method computing sums of next and previous value predictions for all histories. Histories are grouped by length and
+	each group is solved with a single matrix-vector product per direction. Unlike predict_next and predict_previous,
+	which are kept as a reference, it handles histories whose difference pyramid never reaches a layer of zeros.
+	:param values_history: list of histories
+	:return: sum of next value predictions and sum of previous value predictions
+	"""
+	histories_by_length = defaultdict(list)
 	for value_history in values_history:
-		value_history_step = value_history
-		last_from_step = [value_history_step[-1]]
-		while set(value_history_step) != {0}:
-			value_history_step = [v2 - v1 for v1, v2 in zip(value_history_step[:-1], value_history_step[1:])]
-			last_from_step.append(value_history_step[-1])
-		sum_of_predictions += sum(last_from_step)
-	return sum_of_predictions
+		histories_by_length[len(value_history)].append(value_history)
+	sum_of_next = 0
+	sum_of_previous = 0
+	for length, histories in histories_by_length.items():
+		next_weights, previous_weights = get_extrapolation_weights(length=length)
+		max_value = max(max(abs(value) for history in histories for value in history), 1)
+		if max_value * math.comb(length, length // 2) * length * len(histories) < INT64_LIMIT:
+			matrix = np.array(histories, dtype=np.int64)
+			next_weights, previous_weights = next_weights.astype(np.int64), previous_weights.astype(np.int64)
+		else:
+			matrix = np.array(histories, dtype=object)
+		sum_of_next += int((matrix @ next_weights).sum())
+		sum_of_previous += int((matrix @ previous_weights).sum())
+	return sum_of_next, sum_of_previous
+
+
+@dataclass(slots=True)
+class SequenceState:
+	"""
+	Class representing the online state of a single sequence.
+	:param last_values: last element of every difference layer, the sequence itself being layer 0; int64 array unless
+	values outgrow it, then a list of Python integers
+	:param next_prediction: predicted next value, the sum of last_values
+	:param previous_prediction: predicted previous value, the alternating sum of first elements of the layers
+	:param length: number of appended values
+	:param zero_layers: number of layers below last_values holding only zeros so far, they are counted, not stored
+	"""
+	last_values: array | list[int]
+	next_prediction: int = 0
+	previous_prediction: int = 0
+	length: int = 0
+	zero_layers: int = 0
+
+
+class SequenceExtrapolator:
+	"""
+	Class extrapolating many named sequences while their values arrive. Only the last element of every difference layer
+	is kept, and layers holding only zeros are merely counted, so for a sequence of a polynomial of degree d appending a
+	value and updating the next value prediction costs O(d). The first element of a layer never changes once the layer
+	exists, so the previous value prediction is updated only when a new layer appears. Sums of predictions over all
+	sequences are kept as well. Predictions match extrapolate() for the values seen so far.
+	Sequences without a zero layer, e.g. noisy ones, need a layer per value, so their cost grows with their length. With
+	max_depth, deeper layers are dropped, which bounds the cost and is exact for polynomials of degree below max_depth.
+	"""
+	__slots__ = ("sequences", "max_depth", "sum_of_next", "sum_of_previous")
+
+	def __init__(self, max_depth: int | None = None):
+		self.sequences: dict[str, SequenceState] = {}
+		self.max_depth = max_depth
+		self.sum_of_next = 0
+		self.sum_of_previous = 0
+
+	def append(self, name: str, value: int):
+		"""
+		Method appending a value to a sequence, creating the sequence if it does not exist yet.
+		:param name: name of the sequence
+		:param value: appended value
+		"""
+		state = self.sequences.get(name)
+		if state is None:
+			state = self.sequences[name] = SequenceState(last_values=array("q"))
+		self.sum_of_next -= state.next_prediction
+		self.sum_of_previous -= state.previous_prediction
+		last_values = []
+		difference = value
+		for last_value in state.last_values:
+			last_values.append(difference)
+			difference -= last_value
+		# zero layers have zero last elements, so each of them and the new deepest layer receive the same difference
+		layers_count = len(last_values) + state.zero_layers
+		adds_layer = self.max_depth is None or layers_count <= self.max_depth
+		if adds_layer:
+			state.previous_prediction += -difference if layers_count % 2 == 1 else difference
+		if difference == 0:
+			state.zero_layers += int(adds_layer)
+		else:
+			last_values.extend([difference] * (state.zero_layers + int(adds_layer)))
+			state.zero_layers = 0
+		try:
+			state.last_values = array("q", last_values)
+		except OverflowError:
+			state.last_values = last_values
+		state.next_prediction = sum(last_values)
+		state.length += 1
+		self.sum_of_next += state.next_prediction
+		self.sum_of_previous += state.previous_prediction
+
+	def extend(self, name: str, values: Iterable[int]):
+		for value in values:
+			self.append(name=name, value=value)
+
+	def predict_next(self, name: str) -> int:
+		return self.sequences[name].next_prediction
+
+	def predict_previous(self, name: str) -> int:
+		return self.sequences[name].previous_prediction
+
+
+def part_one(values_history: list[list[int]]) -> int:
+	return extrapolate(values_history=values_history)[0]
 
 
 def part_two(values_history: list[list[int]]) -> int:
-	sum_of_predictions = 0
-	for value_history in values_history:
-		value_history_step = value_history
-		first_from_step = [value_history_step[0]]
-		while set(value_history_step) != {0}:
-			value_history_step = [v2 - v1 for v1, v2 in zip(value_history_step[:-1], value_history_step[1:])]
-			first_from_step.append(value_history_step[0])
-		cur_pred_val = 0
-		for val in first_from_step[::-1]:
-			cur_pred_val = val - cur_pred_val
-		sum_of_predictions += cur_pred_val
-	return sum_of_predictions
-
-
-def parse_input() -> list[list[int]]:
-	with open("./input.txt", "r") as f:
-		values_history = [
-			[int(number[0]) for number in re.finditer(r"[0-9\-]+", line)]
-			for line in f.readlines()
-		]
+	return extrapolate(values_history=values_history)[1]
+
+
+def parse_line(line: str) -> list[int]:
+	return [int(number[0]) for number in re.finditer(r"[0-9\-]+", line)]
+
+
+def parse_input(path: str = "./input.txt") -> list[list[int]]:
+	"""
+	Method parsing histories with the shared integer tokenizer, falling back to parse_line for values beyond int64.
+	:param path: path to the input file
+	:return: list of histories
+	"""
+	with open(path, "rb") as f:
+		data = f.read().rstrip()
+	try:
+		return tokenize_integers(data=data).to_lists()
+	except OverflowError:
+		return [parse_line(line=line) for line in data.decode().split("\n")]
+
+
+def parse_input_reference(path: str = "./input.txt") -> list[list[int]]:
+	with open(path, "r") as f:
+		values_history = [parse_line(line=line) for line in f.readlines()]
 	return values_history
 
 
+def solve_shard(path: str, start: int, end: int) -> tuple[int, int]:
+	"""
+	Method parsing the [start, end) byte range of the input file and computing partial answers to both parts.
+	:param path: path to the input file
+	:param start: byte offset of the first line of the range
+	:param end: byte offset at which the range ends
+	:return: partial answers to part one and part two
+	"""
+	with open(path, "rb") as f:
+		f.seek(start)
+		data = f.read(end - start)
+	try:
+		values_history = tokenize_integers(data=data).to_lists()
+	except OverflowError:
+		values_history = [parse_line(line=line) for line in data.decode().splitlines()]
+	return extrapolate(values_history=[value_history for value_history in values_history if len(value_history) > 0])
+
+
 if __name__ == "__main__":
-	input_values_history = parse_input()
-	print(f"Part one: {part_one(values_history=input_values_history)}")
-	print(f"Part two: {part_two(values_history=input_values_history)}")
+	parser = argparse.ArgumentParser()
+	parser.add_argument("--workers", type=int, default=1, help="number of processes used to compute the sums")
+	args = parser.parse_args()
+	if args.workers > 1:
+		answer_one, answer_two = solve_parallel(path="./input.txt", workers=args.workers, solve_shard=solve_shard)
+	else:
+		answer_one, answer_two = extrapolate(values_history=parse_input())
+	print(f"Part one: {answer_one}")
+	print(f"Part two: {answer_two}")
@@ -1,11 +1,18 @@
-def part_one() -> int:
+def parse_input(path: str = "./input.txt") -> list[str]:
+	with open(path, "r") as f:
+		lines = f.readlines()
+	return lines
+
+
+def part_one(lines: list[str]) -> int:
 	pass
 
 
-def part_two() -> int:
+def part_two(lines: list[str]) -> int:
 	pass
 
 
 if __name__ == "__main__":
-	print(f"Part one: {part_one()}")
-	print(f"Part two: {part_two()}")
+	input_lines = parse_input()
+	print(f"Part one: {part_one(lines=input_lines)}")
+	print(f"Part two: {part_two(lines=input_lines)}")